@@ -1,19 +1,32 @@
 import asyncio
+import functools
 import hashlib
 import logging
+import os
 import platform
 import shutil
 import socket
+import struct
 import subprocess
 import time
-import uuid
-from dataclasses import asdict
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
 import httpx
+import orjson
 import psutil
 from dotenv import load_dotenv
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import pynvml
+except ImportError:  # optional "gpu" extra
+    pynvml = None
+
 from agent_service.logging_config import configure_logging
 from agent_service.settings import Settings
 
@@ -22,20 +35,38 @@ settings = Settings.from_env()
 configure_logging(settings.log_level)
 logger = logging.getLogger("agent")
 
+# psutil's CPU/memory counters are meaningless when sampled faster than ~0.1s,
+# so back-to-back calls reuse the previous reading instead of re-reading /proc.
+_MIN_SAMPLE_INTERVAL_SECONDS = 0.2
+_last_metrics_sample: tuple[float, dict[str, float | int | None]] | None = None
+
 
 def load_or_create_node_id(path: Path) -> str:
     path.parent.mkdir(parents=True, exist_ok=True)
-    if path.exists():
-        value = path.read_text(encoding="utf-8").strip()
+
+    # Read-or-create under an exclusive lock so agents starting concurrently against
+    # the same state file agree on a single id.
+    with path.open("a+", encoding="utf-8") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+        handle.seek(0)
+        value = handle.read().strip()
         if value:
             return value
 
-    node_id = f"node-{uuid.uuid4().hex[:12]}"
-    path.write_text(f"{node_id}\n", encoding="utf-8")
-    return node_id
+        node_id = f"node-{os.urandom(6).hex()}"
+        handle.write(f"{node_id}\n")
+        handle.flush()
+        os.fsync(handle.fileno())
+        return node_id
 
 
-def detect_ip() -> str:
+_IP_CACHE_TTL_SECONDS = 60.0
+_cached_ip: tuple[float, str] | None = None
+
+
+def _probe_ip() -> str:
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
         try:
             sock.connect(("8.8.8.8", 80))
@@ -47,6 +78,50 @@ def detect_ip() -> str:
     return "127.0.0.1"
 
 
+def detect_ip() -> str:
+    global _cached_ip
+
+    now = time.monotonic()
+    if _cached_ip is not None and now - _cached_ip[0] < _IP_CACHE_TTL_SECONDS:
+        return _cached_ip[1]
+
+    ip = _probe_ip()
+    _cached_ip = (now, ip)
+    return ip
+
+
+def invalidate_ip_cache() -> None:
+    global _cached_ip
+    _cached_ip = None
+
+
+_nvml_handle: object | None = None
+_nvml_initialized = False
+
+
+def _nvml_device() -> object | None:
+    """Return the NVML handle for GPU 0, initializing NVML on first use.
+
+    Returns None when pynvml is not installed or no NVIDIA driver is present, in
+    which case callers fall back to shelling out to nvidia-smi.
+    """
+
+    global _nvml_handle, _nvml_initialized
+    if _nvml_initialized:
+        return _nvml_handle
+
+    _nvml_initialized = True
+    if pynvml is None:
+        return None
+
+    try:
+        pynvml.nvmlInit()
+        _nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+    except pynvml.NVMLError:
+        _nvml_handle = None
+    return _nvml_handle
+
+
 def _run_nvidia_query(fields: str) -> list[str] | None:
     nvidia_smi = shutil.which("nvidia-smi")
     if nvidia_smi is None:
@@ -60,20 +135,36 @@ def _run_nvidia_query(fields: str) -> list[str] | None:
                 "--format=csv,noheader,nounits",
             ],
             capture_output=True,
-            text=True,
             check=True,
         )
     except (OSError, subprocess.CalledProcessError):
         return None
 
-    rows = [line.strip() for line in result.stdout.strip().splitlines() if line.strip()]
-    if not rows:
+    # CSV output is plain ASCII; only the first GPU row is decoded.
+    first_row = next(
+        (line for line in result.stdout.splitlines() if line.strip()), None
+    )
+    if first_row is None:
         return None
 
-    return [item.strip() for item in rows[0].split(",")]
+    return [
+        item.strip().decode("ascii", errors="replace") for item in first_row.split(b",")
+    ]
 
 
 def detect_gpu_capabilities() -> tuple[str | None, float | None]:
+    handle = _nvml_device()
+    if handle is not None:
+        try:
+            name = pynvml.nvmlDeviceGetName(handle)
+            memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        except pynvml.NVMLError:
+            pass
+        else:
+            if isinstance(name, bytes):
+                name = name.decode("utf-8", errors="replace")
+            return (name or None, round(memory.total / (1024**3), 3))
+
     row = _run_nvidia_query("name,memory.total")
     if row is None or len(row) < 2:
         return (None, None)
@@ -88,6 +179,16 @@ def detect_gpu_capabilities() -> tuple[str | None, float | None]:
 
 
 def detect_gpu_metrics() -> tuple[float | None, float | None]:
+    handle = _nvml_device()
+    if handle is not None:
+        try:
+            utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
+            memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        except pynvml.NVMLError:
+            pass
+        else:
+            return (float(utilization.gpu), round(memory.used / (1024**3), 3))
+
     row = _run_nvidia_query("utilization.gpu,memory.used")
     if row is None or len(row) < 2:
         return (None, None)
@@ -105,7 +206,8 @@ def detect_gpu_metrics() -> tuple[float | None, float | None]:
     return (gpu_percent, vram_used_gb)
 
 
-def detect_capabilities() -> dict[str, object]:
+@functools.lru_cache(maxsize=1)
+def _detect_static_capabilities() -> dict[str, object]:
     cpu_cores = psutil.cpu_count(logical=False)
     cpu_threads = psutil.cpu_count(logical=True)
     ram_total_gb = round(psutil.virtual_memory().total / (1024**3), 3)
@@ -123,26 +225,92 @@ def detect_capabilities() -> dict[str, object]:
     }
 
 
+def detect_capabilities() -> dict[str, object]:
+    # Hardware does not change while the agent runs; probe it once and hand out
+    # copies so callers can extend the dict (e.g. with task_types).
+    capabilities = dict(_detect_static_capabilities())
+    capabilities["labels"] = list(capabilities["labels"])
+    return capabilities
+
+
+_MEMINFO_PATH = Path("/proc/meminfo")
+
+
+def _read_meminfo() -> tuple[int, int] | None:
+    """Return (MemTotal, MemAvailable) in bytes from /proc/meminfo, if readable."""
+
+    try:
+        with _MEMINFO_PATH.open("rb") as handle:
+            # MemTotal, MemFree and MemAvailable are the first three lines.
+            head = handle.read(256)
+    except OSError:
+        return None
+
+    values: dict[bytes, int] = {}
+    for line in head.split(b"\n")[:3]:
+        parts = line.split()
+        if len(parts) >= 2:
+            values[parts[0]] = int(parts[1]) * 1024
+
+    total = values.get(b"MemTotal:")
+    available = values.get(b"MemAvailable:")
+    if not total or available is None:
+        return None
+    return (total, available)
+
+
+def _memory_usage() -> tuple[int, float]:
+    """Return (used bytes, percent) as psutil.virtual_memory() reports them.
+
+    Since psutil 7.1, Linux `used` is MemTotal - MemAvailable (what `free` shows), and
+    `percent` is that share of MemTotal; reading /proc/meminfo directly skips psutil's
+    full parse of the file.
+    """
+
+    meminfo = _read_meminfo()
+    if meminfo is None:
+        memory = psutil.virtual_memory()
+        return (memory.used, float(memory.percent))
+
+    total, available = meminfo
+    used = total - available
+    return (used, round(used / total * 100.0, 1))
+
+
 def collect_metrics(running_jobs: int = 0) -> dict[str, float | int | None]:
-    memory = psutil.virtual_memory()
+    global _last_metrics_sample
+
+    now = time.monotonic()
+    if (
+        _last_metrics_sample is not None
+        and now - _last_metrics_sample[0] < _MIN_SAMPLE_INTERVAL_SECONDS
+    ):
+        return {**_last_metrics_sample[1], "running_jobs": running_jobs}
+
+    ram_used_bytes, ram_percent = _memory_usage()
     gpu_percent, vram_used_gb = detect_gpu_metrics()
 
     metrics: dict[str, float | int | None] = {
         "cpu_percent": float(psutil.cpu_percent(interval=None)),
-        "ram_used_gb": round(memory.used / (1024**3), 3),
-        "ram_percent": float(memory.percent),
+        "ram_used_gb": round(ram_used_bytes / (1024**3), 3),
+        "ram_percent": ram_percent,
         "gpu_percent": gpu_percent,
         "vram_used_gb": vram_used_gb,
         "running_jobs": running_jobs,
     }
-    return metrics
+    _last_metrics_sample = (now, metrics)
+    return dict(metrics)
 
 
-def _task_types_from_capabilities(capabilities: dict[str, object]) -> list[str]:
-    has_gpu = bool(capabilities.get("gpu_name"))
+@functools.lru_cache(maxsize=2)
+def _task_types_for_gpu(has_gpu: bool) -> tuple[str, ...]:
     if has_gpu:
-        return ["INFERENCE", "EMBEDDINGS", "INDEX", "TOKENIZE", "PREPROCESS"]
-    return ["EMBEDDINGS", "INDEX", "TOKENIZE", "PREPROCESS"]
+        return ("INFERENCE", "EMBEDDINGS", "INDEX", "TOKENIZE", "PREPROCESS")
+    return ("EMBEDDINGS", "INDEX", "TOKENIZE", "PREPROCESS")
+
+
+def _task_types_from_capabilities(capabilities: dict[str, object]) -> list[str]:
+    return list(_task_types_for_gpu(bool(capabilities.get("gpu_name"))))
 
 
 def build_register_payload(node_id: str) -> dict[str, object]:
@@ -171,6 +339,28 @@ def _agent_headers() -> dict[str, str]:
     return {"X-EdgeMesh-Secret": settings.edge_mesh_shared_secret}
 
 
+# First 16 digest bytes read as 8 big-endian uint16 lanes, one per embedding dim.
+_EMBEDDING_LANES = struct.Struct(">8H")
+
+
+def _build_client() -> httpx.AsyncClient:
+    # Every cycle talks to the same coordinator, so keep a small warm pool and let
+    # the transport retry connection failures before the agent-level backoff kicks in.
+    return httpx.AsyncClient(
+        base_url=settings.coordinator_url,
+        timeout=httpx.Timeout(20.0, connect=5.0),
+        headers=_agent_headers(),
+        transport=httpx.AsyncHTTPTransport(
+            retries=2,
+            limits=httpx.Limits(
+                max_connections=8,
+                max_keepalive_connections=8,
+                keepalive_expiry=60.0,
+            ),
+        ),
+    )
+
+
 def _payload_text(payload: dict[str, object]) -> str:
     for key in ("text", "item", "payload_ref"):
         value = payload.get(key)
@@ -188,34 +378,43 @@ def _execute_task(task: dict[str, object]) -> dict[str, object]:
     text = _payload_text(payload)
 
     if task_type == "EMBEDDINGS":
-        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
-        vector = [
-            int(digest[index : index + 4], 16) / 65535.0 for index in range(0, 32, 4)
-        ]
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        vector = [lane / 65535.0 for lane in _EMBEDDING_LANES.unpack_from(digest)]
         return {"embedding": vector, "dims": len(vector), "source": text[:64]}
 
     if task_type == "TOKENIZE":
-        tokens = [token for token in text.strip().split() if token]
+        tokens = text.split()
         return {"tokens": tokens[:256], "count": len(tokens)}
 
     if task_type == "PREPROCESS":
-        cleaned = " ".join(text.strip().lower().split())
+        cleaned = " ".join(text.lower().split())
         return {"cleaned_text": cleaned, "length": len(cleaned)}
 
     if task_type == "INDEX":
-        doc_id = hashlib.md5(text.encode("utf-8"), usedforsecurity=False).hexdigest()
+        doc_id = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
         return {"document_id": doc_id, "length": len(text)}
 
     if task_type == "INFERENCE":
-        label = "LONG" if len(text) > 120 else "SHORT"
-        return {"label": label, "score": min(len(text) / 200.0, 1.0)}
+        text_length = len(text)
+        label = "LONG" if text_length > 120 else "SHORT"
+        return {"label": label, "score": min(text_length / 200.0, 1.0)}
 
     return {"message": "Unknown task type", "task_type": task_type}
 
 
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+async def _post_json(
+    client: httpx.AsyncClient, url: str, payload: dict[str, object]
+) -> httpx.Response:
+    # orjson encodes straight to UTF-8 bytes; httpx's json= goes through stdlib json.
+    return await client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+
+
 async def register(client: httpx.AsyncClient, node_id: str) -> None:
-    response = await client.post(
-        "/v1/agent/register", json=build_register_payload(node_id)
+    response = await _post_json(
+        client, "/v1/agent/register", build_register_payload(node_id)
     )
     response.raise_for_status()
 
@@ -223,44 +422,253 @@ async def register(client: httpx.AsyncClient, node_id: str) -> None:
 async def send_heartbeat(
     client: httpx.AsyncClient, node_id: str, running_jobs: int
 ) -> None:
-    response = await client.post(
+    response = await _post_json(
+        client,
         "/v1/agent/heartbeat",
-        json=build_heartbeat_payload(node_id, running_jobs=running_jobs),
+        build_heartbeat_payload(node_id, running_jobs=running_jobs),
     )
     response.raise_for_status()
 
 
-async def pull_task(
-    client: httpx.AsyncClient, node_id: str
-) -> dict[str, object] | None:
-    response = await client.post("/v1/tasks/pull", json={"node_id": node_id})
+async def pull_tasks(
+    client: httpx.AsyncClient, node_id: str, max_tasks: int = 1
+) -> list[dict[str, object]]:
+    response = await _post_json(
+        client, "/v1/tasks/pull", {"node_id": node_id, "max_tasks": max_tasks}
+    )
     response.raise_for_status()
 
-    payload = response.json()
+    payload = orjson.loads(response.content)
+    tasks = payload.get("tasks")
+    if isinstance(tasks, list):
+        return [task for task in tasks if isinstance(task, dict) and task.get("id")]
+
+    # Coordinators without batch support only return the single `task` field.
     task = payload.get("task")
-    if isinstance(task, dict):
-        return task
-    return None
+    if isinstance(task, dict) and task.get("id"):
+        return [task]
+    return []
+
+
+class ResultBatcher:
+    """Coalesce task results into `/v1/tasks/results/batch` requests.
+
+    A batch is flushed once it holds `max_items` results or `max_wait_seconds` after its
+    first result arrived, whichever comes first. `submit` resolves when the coordinator
+    has accepted that specific result.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_items: int = 16,
+        max_wait_seconds: float = 0.05,
+    ) -> None:
+        self._client = client
+        self._max_items = max_items
+        self._max_wait_seconds = max_wait_seconds
+        self._queue: asyncio.Queue[tuple[dict[str, object], asyncio.Future[None]]] = (
+            asyncio.Queue()
+        )
 
+    async def submit(
+        self,
+        task_id: str,
+        node_id: str,
+        success: bool,
+        output: dict[str, object] | None,
+        duration_ms: int,
+    ) -> None:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(
+            (
+                {
+                    "task_id": task_id,
+                    "node_id": node_id,
+                    "success": success,
+                    "output": output,
+                    "duration_ms": duration_ms,
+                },
+                future,
+            )
+        )
+        await future
 
-async def submit_task_result(
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait_seconds
+            while len(batch) < self._max_items:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(
+        self, batch: list[tuple[dict[str, object], asyncio.Future[None]]]
+    ) -> None:
+        try:
+            response = await _post_json(
+                self._client,
+                "/v1/tasks/results/batch",
+                {"results": [item for item, _ in batch]},
+            )
+            response.raise_for_status()
+            rejected = {
+                str(entry.get("task_id")): str(entry.get("detail"))
+                for entry in orjson.loads(response.content).get("rejected", [])
+            }
+        except Exception as exc:  # noqa: BLE001
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        # Results are matched back to callers by task_id, never by position.
+        for item, future in batch:
+            if future.done():
+                continue
+            detail = rejected.get(str(item["task_id"]))
+            if detail is None:
+                future.set_result(None)
+            else:
+                future.set_exception(RuntimeError(detail))
+
+
+@dataclass(slots=True)
+class AgentState:
+    running_jobs: int = 0
+
+
+async def _process_task(
+    batcher: ResultBatcher, node_id: str, task: dict[str, object], state: AgentState
+) -> None:
+    task_id = str(task.get("id", ""))
+    state.running_jobs += 1
+    try:
+        started = time.perf_counter()
+        success = True
+        output: dict[str, object] | None = None
+
+        try:
+            # Task bodies are CPU-bound; run them off the event loop so heartbeats
+            # and other workers keep making progress.
+            output = await asyncio.to_thread(_execute_task, task)
+        except Exception as exc:  # noqa: BLE001
+            success = False
+            output = {"error": str(exc)}
+
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        await batcher.submit(
+            task_id=task_id,
+            node_id=node_id,
+            success=success,
+            output=output,
+            duration_ms=duration_ms,
+        )
+        logger.info(
+            "task_processed",
+            extra={
+                "node_id": node_id,
+                "task_id": task_id,
+                "success": success,
+                "duration_ms": duration_ms,
+            },
+        )
+    finally:
+        state.running_jobs = max(state.running_jobs - 1, 0)
+
+
+async def heartbeat_loop(
+    client: httpx.AsyncClient, node_id: str, state: AgentState
+) -> None:
+    while True:
+        try:
+            await send_heartbeat(
+                client=client, node_id=node_id, running_jobs=state.running_jobs
+            )
+            logger.info(
+                "heartbeat_sent",
+                extra={"node_id": node_id, "running_jobs": state.running_jobs},
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "heartbeat_failed", extra={"node_id": node_id, "error": str(exc)}
+            )
+        await asyncio.sleep(settings.heartbeat_seconds)
+
+
+async def dispatch_loop(
     client: httpx.AsyncClient,
-    task_id: str,
     node_id: str,
-    success: bool,
-    output: dict[str, object] | None,
-    duration_ms: int,
+    slots: asyncio.Semaphore,
+    queue: asyncio.Queue[dict[str, object]],
 ) -> None:
-    response = await client.post(
-        f"/v1/tasks/{task_id}/result",
-        json={
-            "node_id": node_id,
-            "success": success,
-            "output": output,
-            "duration_ms": duration_ms,
-        },
-    )
-    response.raise_for_status()
+    retry_delay = 1.0
+    while True:
+        await slots.acquire()
+        free_slots = 1
+        while not slots.locked():
+            await slots.acquire()
+            free_slots += 1
+
+        try:
+            tasks = await pull_tasks(
+                client=client, node_id=node_id, max_tasks=free_slots
+            )
+        except Exception as exc:  # noqa: BLE001
+            for _ in range(free_slots):
+                slots.release()
+            logger.warning(
+                "agent_cycle_failed",
+                extra={
+                    "node_id": node_id,
+                    "error": str(exc),
+                    "retry_delay_seconds": retry_delay,
+                },
+            )
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30.0)
+            continue
+
+        retry_delay = 1.0
+        for _ in range(free_slots - len(tasks)):
+            slots.release()
+        for task in tasks:
+            queue.put_nowait(task)
+
+        if not tasks:
+            await asyncio.sleep(settings.task_poll_seconds)
+
+
+async def worker_loop(
+    batcher: ResultBatcher,
+    node_id: str,
+    state: AgentState,
+    slots: asyncio.Semaphore,
+    queue: asyncio.Queue[dict[str, object]],
+) -> None:
+    while True:
+        task = await queue.get()
+        try:
+            await _process_task(batcher, node_id, task, state)
+        except Exception as exc:  # noqa: BLE001
+            # The coordinator requeues the task once its lease expires.
+            logger.warning(
+                "task_processing_failed",
+                extra={
+                    "node_id": node_id,
+                    "task_id": task.get("id"),
+                    "error": str(exc),
+                },
+            )
+        finally:
+            slots.release()
 
 
 async def run_agent() -> None:
@@ -270,20 +678,15 @@ async def run_agent() -> None:
     )
 
     retry_delay = 1.0
-    running_jobs = 0
-    next_heartbeat_at = 0.0
 
-    async with httpx.AsyncClient(
-        base_url=settings.coordinator_url,
-        timeout=20.0,
-        headers=_agent_headers(),
-    ) as client:
+    async with _build_client() as client:
         while True:
             try:
                 await register(client=client, node_id=node_id)
                 logger.info("agent_registered", extra={"node_id": node_id})
                 break
             except Exception as exc:  # noqa: BLE001
+                invalidate_ip_cache()
                 logger.warning(
                     "agent_register_failed",
                     extra={
@@ -295,77 +698,24 @@ async def run_agent() -> None:
                 await asyncio.sleep(retry_delay)
                 retry_delay = min(retry_delay * 2, 30.0)
 
-        retry_delay = 1.0
-        next_heartbeat_at = time.monotonic()
-
-        while True:
-            try:
-                now = time.monotonic()
-                if now >= next_heartbeat_at:
-                    await send_heartbeat(
-                        client=client,
-                        node_id=node_id,
-                        running_jobs=running_jobs,
-                    )
-                    logger.info(
-                        "heartbeat_sent",
-                        extra={"node_id": node_id, "running_jobs": running_jobs},
-                    )
-                    next_heartbeat_at = now + settings.heartbeat_seconds
-
-                task = await pull_task(client=client, node_id=node_id)
-                if task is None:
-                    await asyncio.sleep(settings.task_poll_seconds)
-                    continue
-
-                task_id = str(task.get("id", ""))
-                if not task_id:
-                    await asyncio.sleep(settings.task_poll_seconds)
-                    continue
-
-                running_jobs += 1
-                started = time.perf_counter()
-                success = True
-                output: dict[str, object] | None = None
-
-                try:
-                    output = _execute_task(task)
-                except Exception as exc:  # noqa: BLE001
-                    success = False
-                    output = {"error": str(exc)}
-
-                duration_ms = int((time.perf_counter() - started) * 1000)
-                await submit_task_result(
-                    client=client,
-                    task_id=task_id,
-                    node_id=node_id,
-                    success=success,
-                    output=output,
-                    duration_ms=duration_ms,
-                )
-                logger.info(
-                    "task_processed",
-                    extra={
-                        "node_id": node_id,
-                        "task_id": task_id,
-                        "success": success,
-                        "duration_ms": duration_ms,
-                    },
-                )
-                running_jobs = max(running_jobs - 1, 0)
-                retry_delay = 1.0
-            except Exception as exc:  # noqa: BLE001
-                running_jobs = max(running_jobs - 1, 0)
-                logger.warning(
-                    "agent_cycle_failed",
-                    extra={
-                        "node_id": node_id,
-                        "error": str(exc),
-                        "retry_delay_seconds": retry_delay,
-                    },
-                )
-                await asyncio.sleep(retry_delay)
-                retry_delay = min(retry_delay * 2, 30.0)
+        # One slot per worker: the dispatcher pulls at most as many tasks as there
+        # are free workers, so leases are never held by tasks waiting in memory.
+        concurrency = max(settings.max_concurrency, 1)
+        state = AgentState()
+        slots = asyncio.Semaphore(concurrency)
+        queue: asyncio.Queue[dict[str, object]] = asyncio.Queue()
+
+        batcher = ResultBatcher(client)
+
+        await asyncio.gather(
+            heartbeat_loop(client, node_id, state),
+            dispatch_loop(client, node_id, slots, queue),
+            batcher.run(),
+            *(
+                worker_loop(batcher, node_id, state, slots, queue)
+                for _ in range(concurrency)
+            ),
+        )
 
 
 def main() -> None:
@@ -11,6 +11,7 @@ class Settings:
     agent_port: int
     heartbeat_seconds: float
     task_poll_seconds: float
+    max_concurrency: int
     log_level: str
     state_file: Path
     edge_mesh_shared_secret: str
@@ -25,6 +26,9 @@ class Settings:
             agent_port=int(os.getenv("AGENT_PORT", "9100")),
             heartbeat_seconds=float(os.getenv("HEARTBEAT_SECONDS", "2")),
             task_poll_seconds=float(os.getenv("TASK_POLL_SECONDS", "2")),
+            max_concurrency=int(
+                os.getenv("AGENT_MAX_CONCURRENCY", str(os.cpu_count() or 1))
+            ),
             log_level=os.getenv("AGENT_LOG_LEVEL", "INFO"),
             state_file=Path(os.getenv("NODE_ID_FILE", "state/node_id.txt")),
             edge_mesh_shared_secret=os.getenv("EDGE_MESH_SHARED_SECRET", "").strip(),
@@ -17,6 +17,16 @@ def test_load_or_create_node_id_is_persistent(tmp_path: Path) -> None:
     assert first.startswith("node-")
 
 
+def test_load_or_create_node_id_fills_empty_file(tmp_path: Path) -> None:
+    file_path = tmp_path / "node_id.txt"
+    file_path.write_text("\n", encoding="utf-8")
+
+    node_id = load_or_create_node_id(file_path)
+
+    assert node_id.startswith("node-")
+    assert file_path.read_text(encoding="utf-8").strip() == node_id
+
+
 def test_task_types_prefer_gpu_for_inference() -> None:
     gpu_types = _task_types_from_capabilities({"gpu_name": "NVIDIA"})
     cpu_types = _task_types_from_capabilities({"gpu_name": None})
@@ -50,3 +60,29 @@ def test_execute_task_generates_embedding_shape() -> None:
     assert "embedding" in result
     assert isinstance(result["embedding"], list)
     assert result["dims"] == len(result["embedding"])
+
+
+def test_collect_metrics_reuses_recent_sample(monkeypatch) -> None:
+    from agent_service import main
+
+    clock = [100.0]
+    cpu_samples = iter([10.0, 20.0])
+    monkeypatch.setattr(main, "_last_metrics_sample", None)
+    monkeypatch.setattr(main.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(
+        main.psutil, "cpu_percent", lambda interval=None: next(cpu_samples)
+    )
+
+    first = main.collect_metrics(running_jobs=1)
+    clock[0] += main._MIN_SAMPLE_INTERVAL_SECONDS / 2
+    second = main.collect_metrics(running_jobs=3)
+
+    assert first["running_jobs"] == 1
+    assert second["running_jobs"] == 3
+    assert second["cpu_percent"] == first["cpu_percent"] == 10.0
+
+    clock[0] += main._MIN_SAMPLE_INTERVAL_SECONDS
+    third = main.collect_metrics(running_jobs=2)
+
+    assert third["running_jobs"] == 2
+    assert third["cpu_percent"] == 20.0
@@ -5,16 +5,25 @@ from fastapi import Header, HTTPException, status
 
 _SECRET_HEADER = "X-EdgeMesh-Secret"
 
+_expected_secret = os.getenv("EDGE_MESH_SHARED_SECRET", "").strip()
+
+
+def configure_agent_secret(secret: str) -> None:
+    """Set the shared secret agents must present; an empty value disables the check."""
+
+    global _expected_secret
+    _expected_secret = secret.strip()
+
 
 def require_agent_secret(
     x_edgemesh_secret: str | None = Header(default=None, alias=_SECRET_HEADER),
 ) -> None:
-    expected = os.getenv("EDGE_MESH_SHARED_SECRET", "").strip()
+    expected = _expected_secret
     if not expected:
         return
 
-    provided = (x_edgemesh_secret or "").strip()
-    if not hmac.compare_digest(provided, expected):
+    # HTTP servers already strip surrounding whitespace from header values.
+    if not hmac.compare_digest(x_edgemesh_secret or "", expected):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing shared secret",
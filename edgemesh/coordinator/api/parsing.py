@@ -0,0 +1,22 @@
+from fastapi import HTTPException
+
+from models import TaskType
+
+_TASK_TYPE_ALIASES: dict[str, TaskType] = {
+    "INFER": TaskType.INFERENCE,
+    "INFERENCE": TaskType.INFERENCE,
+    "EMBED": TaskType.EMBEDDINGS,
+    "EMBEDDING": TaskType.EMBEDDINGS,
+    "EMBEDDINGS": TaskType.EMBEDDINGS,
+    "INDEX": TaskType.INDEX,
+    "TOKENIZE": TaskType.TOKENIZE,
+    "PREPROCESS": TaskType.PREPROCESS,
+    "PREPROCESSING": TaskType.PREPROCESS,
+}
+
+
+def parse_task_type(raw: str) -> TaskType:
+    task_type = _TASK_TYPE_ALIASES.get(raw.strip().upper())
+    if task_type is None:
+        raise HTTPException(status_code=422, detail=f"Unsupported task_type '{raw}'")
+    return task_type
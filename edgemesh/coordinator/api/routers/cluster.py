@@ -19,9 +19,8 @@ async def cluster_summary() -> ClusterSummaryResponse:
     nodes = get_nodes()
 
     total_nodes = len(nodes)
-    online_nodes = sum(1 for node in nodes if node.status == NodeStatus.ONLINE)
-    offline_nodes = sum(1 for node in nodes if node.status == NodeStatus.OFFLINE)
-
+    online_nodes = 0
+    offline_nodes = 0
     total_effective_cpu_threads = 0.0
     total_effective_ram_gb = 0.0
     total_effective_vram_gb = 0.0
@@ -30,7 +29,14 @@ async def cluster_summary() -> ClusterSummaryResponse:
     for node in nodes:
         active_running_jobs_total += node.metrics.running_jobs
 
-        if not node.policy.enabled or node.status != NodeStatus.ONLINE:
+        if node.status == NodeStatus.OFFLINE:
+            offline_nodes += 1
+            continue
+        if node.status != NodeStatus.ONLINE:
+            continue
+
+        online_nodes += 1
+        if not node.policy.enabled:
             continue
 
         capacity = compute_effective_capacity(node)
@@ -1,8 +1,9 @@
-import uuid
+import os
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Body, HTTPException, Query, status
 
+from api.parsing import parse_task_type
 from api.schemas import DemoJobBurstResponse, JobCreateRequest, JobStatusUpdateRequest
 from api.state import job_event_bus
 from db import (
@@ -16,75 +17,46 @@ from db import (
     transition_job_status,
 )
 from models import Job, JobStatus, JobUpdateEvent, Task, TaskType
-from scheduler import evaluate_node_eligibility, score_node
+from scheduler import rank_nodes
 
 router = APIRouter(prefix="/v1", tags=["jobs"])
 
+_JOB_STATUSES: dict[str, JobStatus] = {status.value: status for status in JobStatus}
+
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-async def _publish_job_update(job: Job) -> None:
-    await job_event_bus.publish(
-        JobUpdateEvent(
-            job_id=job.id,
-            status=job.status,
-            total_tasks=job.total_tasks,
-            completed_tasks=job.completed_tasks,
-            failed_tasks=job.failed_tasks,
-            updated_at=job.updated_at,
-        )
-    )
+def _short_id(prefix: str) -> str:
+    return f"{prefix}-{os.urandom(6).hex()}"
 
 
-def _parse_task_type(raw: str) -> TaskType:
-    normalized = raw.strip().upper()
-    mapping = {
-        "INFER": TaskType.INFERENCE,
-        "INFERENCE": TaskType.INFERENCE,
-        "EMBED": TaskType.EMBEDDINGS,
-        "EMBEDDING": TaskType.EMBEDDINGS,
-        "EMBEDDINGS": TaskType.EMBEDDINGS,
-        "INDEX": TaskType.INDEX,
-        "TOKENIZE": TaskType.TOKENIZE,
-        "PREPROCESS": TaskType.PREPROCESS,
-        "PREPROCESSING": TaskType.PREPROCESS,
-    }
+def _job_update_event(job: Job) -> JobUpdateEvent:
+    return JobUpdateEvent(
+        job_id=job.id,
+        status=job.status,
+        total_tasks=job.total_tasks,
+        completed_tasks=job.completed_tasks,
+        failed_tasks=job.failed_tasks,
+        updated_at=job.updated_at,
+    )
 
-    task_type = mapping.get(normalized)
-    if task_type is None:
-        raise HTTPException(status_code=422, detail=f"Unsupported task_type '{raw}'")
-    return task_type
+
+async def _publish_job_update(job: Job) -> None:
+    await job_event_bus.publish(_job_update_event(job))
 
 
 def _parse_job_status(raw: str) -> JobStatus:
-    normalized = raw.strip().upper()
-    mapping = {
-        "QUEUED": JobStatus.QUEUED,
-        "RUNNING": JobStatus.RUNNING,
-        "COMPLETED": JobStatus.COMPLETED,
-        "FAILED": JobStatus.FAILED,
-        "CANCELLED": JobStatus.CANCELLED,
-    }
-
-    parsed = mapping.get(normalized)
+    parsed = _JOB_STATUSES.get(raw.strip().upper())
     if parsed is None:
         raise HTTPException(status_code=422, detail=f"Unsupported status '{raw}'")
     return parsed
 
 
 def _pick_node_for_task(task_type: TaskType) -> str | None:
-    candidates: list[tuple[str, bool, float]] = []
-
-    for node in get_nodes():
-        eligible, _ = evaluate_node_eligibility(node, task_type)
-        score = score_node(node, task_type)
-        candidates.append((node.identity.node_id, eligible, score))
-
-    candidates.sort(key=lambda item: (item[1], item[2]), reverse=True)
-    chosen = next((candidate for candidate in candidates if candidate[1]), None)
-    return chosen[0] if chosen is not None else None
+    ranked = rank_nodes(get_nodes(), task_type)
+    return ranked[0][0] if ranked else None
 
 
 def _build_task_payloads(
@@ -130,11 +102,11 @@ async def create_job_route(
 ) -> Job:
     """Create a distributed job and split it into executable tasks."""
 
-    task_type = _parse_task_type(payload.task_type)
+    task_type = parse_task_type(payload.task_type)
 
     job = create_job(
         Job(
-            id=f"job-{uuid.uuid4().hex[:12]}",
+            id=_short_id("job"),
             type=task_type,
             status=JobStatus.QUEUED,
             payload_ref=payload.payload_ref,
@@ -170,7 +142,7 @@ async def list_jobs_route(
         _parse_job_status(status_filter) if status_filter is not None else None
     )
     task_type_value = (
-        _parse_task_type(task_type_filter) if task_type_filter is not None else None
+        parse_task_type(task_type_filter) if task_type_filter is not None else None
     )
     return list_jobs(status=status_value, task_type=task_type_value, node_id=node_id)
 
@@ -234,10 +206,13 @@ async def create_embed_burst(
     jobs: list[Job] = []
     assigned_count = 0
 
+    # Node metrics only change on heartbeats, so one ranking serves the whole burst.
+    assigned_node_id = _pick_node_for_task(TaskType.EMBEDDINGS)
+
     for index in range(count):
         job = create_job(
             Job(
-                id=f"job-{uuid.uuid4().hex[:12]}",
+                id=_short_id("job"),
                 type=TaskType.EMBEDDINGS,
                 status=JobStatus.QUEUED,
                 payload_ref=f"demo://embed/{index:04d}",
@@ -261,7 +236,6 @@ async def create_embed_burst(
             max_retries=2,
         )
 
-        assigned_node_id = _pick_node_for_task(TaskType.EMBEDDINGS)
         if assigned_node_id is not None:
             assigned_count += 1
             assign_job(job.id, assigned_node_id)
@@ -269,7 +243,8 @@ async def create_embed_burst(
         refreshed = get_job(job.id)
         if refreshed is not None:
             jobs.append(refreshed)
-            await _publish_job_update(refreshed)
+
+    await job_event_bus.publish_many(_job_update_event(job) for job in jobs)
 
     queued_count = sum(1 for item in jobs if item.status == JobStatus.QUEUED)
     running_count = sum(1 for item in jobs if item.status == JobStatus.RUNNING)
@@ -7,30 +7,89 @@ from api.state import job_event_bus, node_event_bus
 
 router = APIRouter(prefix="/v1/stream", tags=["stream"])
 
+_KEEPALIVE_FRAME = b": keep-alive\n\n"
+_JOB_EVENT_PREFIX = b"event: job_update\ndata: "
+_FRAME_SUFFIX = b"\n\n"
+_OVERFLOW_EVENT_PREFIX = b"event: stream_overflow\ndata: "
+# Stop reverse proxies (nginx in particular) from buffering frames until a chunk fills.
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+_keepalive_seconds = 25.0
+
+
+def configure_sse_keepalive(seconds: float) -> None:
+    """Set how long an idle SSE stream waits before sending a keep-alive comment."""
+
+    global _keepalive_seconds
+    _keepalive_seconds = seconds
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _next_or_disconnect(
+    pending: asyncio.Task, disconnected: asyncio.Task, timeout: float
+) -> bool:
+    """Wait for `pending`, the client going away, or the keep-alive timeout.
+
+    Returns False once the client has disconnected. `pending` is left running on timeout
+    so no event it was about to deliver is lost.
+    """
+
+    await asyncio.wait(
+        (pending, disconnected),
+        timeout=timeout,
+        return_when=asyncio.FIRST_COMPLETED,
+    )
+    return not disconnected.done()
+
 
 @router.get("/nodes")
 async def stream_nodes(request: Request) -> StreamingResponse:
     """Server-Sent Events stream for node updates.
 
     Emits `node_update` events whenever heartbeat metrics are updated or when a node status changes.
+    A `stream_overflow` event with the number of dropped updates precedes the next update
+    when this client fell too far behind.
     """
 
     async def generator():
+        keepalive = _keepalive_seconds
         queue = await node_event_bus.subscribe()
+        disconnected = asyncio.create_task(_wait_for_disconnect(request))
+        ready = asyncio.create_task(queue.wait())
         try:
-            while True:
-                if await request.is_disconnected():
-                    break
-
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=15)
-                    yield f"event: node_update\ndata: {event.model_dump_json()}\n\n"
-                except asyncio.TimeoutError:
-                    yield ": keep-alive\n\n"
+            while await _next_or_disconnect(ready, disconnected, keepalive):
+                if not ready.done():
+                    yield _KEEPALIVE_FRAME
+                    continue
+
+                frames: list[bytes] = []
+                if queue.dropped:
+                    # Tell the client it missed updates so it can refetch /v1/nodes.
+                    dropped, queue.dropped = queue.dropped, 0
+                    frames.append(
+                        _OVERFLOW_EVENT_PREFIX
+                        + f'{{"dropped":{dropped}}}'.encode()
+                        + _FRAME_SUFFIX
+                    )
+                frames.extend(queue.drain())
+                ready = asyncio.create_task(queue.wait())
+                # Everything pending goes out in a single body chunk.
+                yield b"".join(frames)
         finally:
+            ready.cancel()
+            disconnected.cancel()
             await node_event_bus.unsubscribe(queue)
 
-    return StreamingResponse(generator(), media_type="text/event-stream")
+    return StreamingResponse(
+        generator(), media_type="text/event-stream", headers=_SSE_HEADERS
+    )
 
 
 @router.get("/jobs")
@@ -41,18 +100,26 @@ async def stream_jobs(request: Request) -> StreamingResponse:
     """
 
     async def generator():
+        keepalive = _keepalive_seconds
         queue = await job_event_bus.subscribe()
+        disconnected = asyncio.create_task(_wait_for_disconnect(request))
+        next_event = asyncio.create_task(queue.get())
         try:
-            while True:
-                if await request.is_disconnected():
-                    break
-
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=15)
-                    yield f"event: job_update\ndata: {event.model_dump_json()}\n\n"
-                except asyncio.TimeoutError:
-                    yield ": keep-alive\n\n"
+            while await _next_or_disconnect(next_event, disconnected, keepalive):
+                if not next_event.done():
+                    yield _KEEPALIVE_FRAME
+                    continue
+
+                event = next_event.result()
+                next_event = asyncio.create_task(queue.get())
+                yield (
+                    _JOB_EVENT_PREFIX + event.model_dump_json().encode() + _FRAME_SUFFIX
+                )
         finally:
+            next_event.cancel()
+            disconnected.cancel()
             await job_event_bus.unsubscribe(queue)
 
-    return StreamingResponse(generator(), media_type="text/event-stream")
+    return StreamingResponse(
+        generator(), media_type="text/event-stream", headers=_SSE_HEADERS
+    )
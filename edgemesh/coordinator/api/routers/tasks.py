@@ -7,11 +7,14 @@ from api.auth import require_agent_secret
 from api.schemas import (
     TaskPullRequest,
     TaskPullResponse,
+    TaskResultBatchRequest,
+    TaskResultBatchResponse,
+    TaskResultRejection,
     TaskResultSubmitRequest,
     TaskResultSubmitResponse,
 )
 from api.state import job_event_bus
-from db import get_job, pull_task_for_node, submit_task_result
+from db import get_job, pull_tasks_for_node, submit_task_result
 from models import Job, JobUpdateEvent, TaskResult
 
 router = APIRouter(prefix="/v1/tasks", tags=["tasks"])
@@ -21,8 +24,14 @@ def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _lease_seconds() -> int:
-    return int(os.getenv("TASK_LEASE_SECONDS", "30"))
+_lease_seconds = int(os.getenv("TASK_LEASE_SECONDS", "30"))
+
+
+def configure_task_lease(seconds: int) -> None:
+    """Set how long a pulled task stays leased to its node before it can be recovered."""
+
+    global _lease_seconds
+    _lease_seconds = seconds
 
 
 async def _publish_job_update(job: Job) -> None:
@@ -50,18 +59,109 @@ async def pull_task(
             "default": {
                 "summary": "Agent pulls next task",
                 "value": {"node_id": "node-123"},
-            }
+            },
+            "batch": {
+                "summary": "Agent pulls up to four tasks",
+                "value": {"node_id": "node-123", "max_tasks": 4},
+            },
         },
     ),
 ) -> TaskPullResponse:
-    """Pull the next eligible task for a node using scheduler + policy constraints."""
+    """Pull the next eligible tasks for a node using scheduler + policy constraints.
 
-    task = pull_task_for_node(node_id=payload.node_id, lease_seconds=_lease_seconds())
-    if task is not None:
-        job = get_job(task.job_id)
+    Up to `max_tasks` tasks are leased in one call; `task` mirrors the first entry of
+    `tasks` for single-task clients.
+    """
+
+    tasks = pull_tasks_for_node(
+        node_id=payload.node_id,
+        lease_seconds=_lease_seconds,
+        max_tasks=payload.max_tasks,
+    )
+    for job_id in dict.fromkeys(task.job_id for task in tasks):
+        job = get_job(job_id)
         if job is not None:
             await _publish_job_update(job)
-    return TaskPullResponse(task=task)
+    return TaskPullResponse(task=tasks[0] if tasks else None, tasks=tasks)
+
+
+@router.post(
+    "/results/batch",
+    response_model=TaskResultBatchResponse,
+    dependencies=[Depends(require_agent_secret)],
+)
+async def submit_results_batch(
+    payload: TaskResultBatchRequest = Body(
+        ...,
+        examples={
+            "default": {
+                "summary": "Agent reports two task results",
+                "value": {
+                    "results": [
+                        {
+                            "task_id": "task-1",
+                            "node_id": "node-123",
+                            "success": True,
+                            "output": {"items_processed": 128},
+                            "duration_ms": 380,
+                        },
+                        {
+                            "task_id": "task-2",
+                            "node_id": "node-123",
+                            "success": False,
+                            "output": {"error": "timeout"},
+                            "duration_ms": 2000,
+                        },
+                    ]
+                },
+            }
+        },
+    ),
+) -> TaskResultBatchResponse:
+    """Submit several task results in one request.
+
+    Each result is applied independently with the same rules as the single-result
+    endpoint; results that cannot be applied are listed in `rejected` instead of
+    failing the whole batch.
+    """
+
+    response = TaskResultBatchResponse()
+    updated_jobs: dict[str, Job] = {}
+    for item in payload.results:
+        try:
+            task, job = submit_task_result(
+                TaskResult(
+                    task_id=item.task_id,
+                    node_id=item.node_id,
+                    success=item.success,
+                    output=item.output,
+                    duration_ms=item.duration_ms,
+                    created_at=_utc_now(),
+                )
+            )
+        except KeyError:
+            response.rejected.append(
+                TaskResultRejection(
+                    task_id=item.task_id,
+                    status_code=404,
+                    detail=f"Task '{item.task_id}' not found",
+                )
+            )
+            continue
+        except ValueError as exc:
+            response.rejected.append(
+                TaskResultRejection(
+                    task_id=item.task_id, status_code=409, detail=str(exc)
+                )
+            )
+            continue
+
+        response.accepted.append(task)
+        updated_jobs[job.id] = job
+
+    for job in updated_jobs.values():
+        await _publish_job_update(job)
+    return response
 
 
 @router.post(
@@ -96,10 +96,12 @@ class DemoJobBurstResponse(BaseModel):
 
 class TaskPullRequest(BaseModel):
     node_id: str = Field(min_length=1, max_length=128)
+    max_tasks: int = Field(default=1, ge=1, le=64)
 
 
 class TaskPullResponse(BaseModel):
     task: Task | None = None
+    tasks: list[Task] = Field(default_factory=list)
 
 
 class TaskResultSubmitRequest(BaseModel):
@@ -114,6 +116,25 @@ class TaskResultSubmitResponse(BaseModel):
     job: Job
 
 
+class TaskResultBatchItem(TaskResultSubmitRequest):
+    task_id: str = Field(min_length=1, max_length=128)
+
+
+class TaskResultBatchRequest(BaseModel):
+    results: list[TaskResultBatchItem] = Field(min_length=1, max_length=256)
+
+
+class TaskResultRejection(BaseModel):
+    task_id: str
+    status_code: int
+    detail: str
+
+
+class TaskResultBatchResponse(BaseModel):
+    accepted: list[Task] = Field(default_factory=list)
+    rejected: list[TaskResultRejection] = Field(default_factory=list)
+
+
 class ExecutionMetricsResponse(BaseModel):
     total_results: int
     success_results: int
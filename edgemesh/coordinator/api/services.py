@@ -6,7 +6,7 @@ from api.schemas import (
     AgentRegisterV1Request,
 )
 from api.state import metrics_history_buffer, node_event_bus
-from db import update_node_metrics, upsert_node_capabilities, upsert_node_identity
+from db import record_node_heartbeat, upsert_node_capabilities, upsert_node_identity
 from models import Node, NodeCapabilities, NodeMetrics, NodeUpdateEvent, TaskType
 
 
@@ -111,15 +111,8 @@ async def heartbeat_agent_v1(payload: AgentHeartbeatV1Request) -> NodeUpdateEven
         extra=payload.metrics.model_dump(mode="json", exclude_none=True),
     )
 
-    node = update_node_metrics(node_id=payload.node_id, metrics=metrics)
-    metrics_history_buffer.append(payload.node_id, node.metrics)
-
-    event = NodeUpdateEvent(
-        node_id=node.identity.node_id,
-        status=node.status,
-        metrics=node.metrics,
-        updated_at=node.updated_at,
-    )
+    event = record_node_heartbeat(node_id=payload.node_id, metrics=metrics)
+    metrics_history_buffer.append(payload.node_id, event.metrics)
     await node_event_bus.publish(event)
     return event
 
@@ -5,36 +5,89 @@ from threading import Lock
 
 from models import JobUpdateEvent, NodeMetrics, NodeUpdateEvent
 
+_NODE_EVENT_PREFIX = b"event: node_update\ndata: "
+_FRAME_SUFFIX = b"\n\n"
+
+
+class NodeEventQueue:
+    """Bounded per-subscriber buffer of rendered node update frames with a single wake-up event.
+
+    There is exactly one producer (the bus) and one consumer (the SSE generator), both on
+    the event loop, so a plain deque plus an `asyncio.Event` replaces `asyncio.Queue`'s
+    per-item getter futures. The consumer drains everything pending in one go.
+
+    Node updates are idempotent snapshots, so on overflow an older pending event for the
+    same node is discarded first. Only when no such event exists is the oldest event
+    dropped; those drops are counted in `dropped` so the stream can report them.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = max(maxsize, 1)
+        self._events: deque[tuple[str, bytes]] = deque()
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, node_id: str, frame: bytes) -> None:
+        if len(self._events) >= self._maxsize:
+            self._discard_pending(node_id)
+        if len(self._events) >= self._maxsize:
+            self._events.popleft()
+            self.dropped += 1
+        self._events.append((node_id, frame))
+        self._ready.set()
+
+    async def wait(self) -> None:
+        await self._ready.wait()
+
+    def drain(self) -> list[bytes]:
+        frames = [frame for _, frame in self._events]
+        self._events.clear()
+        self._ready.clear()
+        return frames
+
+    def _discard_pending(self, node_id: str) -> None:
+        for index, (pending_node_id, _) in enumerate(self._events):
+            if pending_node_id == node_id:
+                del self._events[index]
+                return
+
 
 class NodeEventBus:
     def __init__(self, queue_size: int = 256) -> None:
         self._queue_size = queue_size
-        self._subscribers: set[asyncio.Queue[NodeUpdateEvent]] = set()
+        self._subscribers: set[NodeEventQueue] = set()
         self._lock = asyncio.Lock()
 
-    async def subscribe(self) -> asyncio.Queue[NodeUpdateEvent]:
-        queue: asyncio.Queue[NodeUpdateEvent] = asyncio.Queue(maxsize=self._queue_size)
+    async def subscribe(self) -> NodeEventQueue:
+        queue = NodeEventQueue(maxsize=self._queue_size)
         async with self._lock:
             self._subscribers.add(queue)
         return queue
 
-    async def unsubscribe(self, queue: asyncio.Queue[NodeUpdateEvent]) -> None:
+    async def unsubscribe(self, queue: NodeEventQueue) -> None:
         async with self._lock:
             self._subscribers.discard(queue)
 
     async def publish(self, event: NodeUpdateEvent) -> None:
+        await self.publish_many((event,))
+
+    async def publish_many(self, events: Iterable[NodeUpdateEvent]) -> None:
         async with self._lock:
-            subscribers: Iterable[asyncio.Queue[NodeUpdateEvent]] = tuple(
-                self._subscribers
+            subscribers: Iterable[NodeEventQueue] = tuple(self._subscribers)
+        if not subscribers:
+            return
+
+        # Serialize once and hand every subscriber the same SSE frames.
+        frames = [
+            (
+                event.node_id,
+                _NODE_EVENT_PREFIX + event.model_dump_json().encode() + _FRAME_SUFFIX,
             )
-
+            for event in events
+        ]
         for queue in subscribers:
-            if queue.full():
-                try:
-                    queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    pass
-            queue.put_nowait(event)
+            for node_id, frame in frames:
+                queue.offer(node_id, frame)
 
 
 class JobEventBus:
@@ -54,18 +107,26 @@ class JobEventBus:
             self._subscribers.discard(queue)
 
     async def publish(self, event: JobUpdateEvent) -> None:
+        await self.publish_many((event,))
+
+    async def publish_many(self, events: Iterable[JobUpdateEvent]) -> None:
+        events = tuple(events)
+        if not events:
+            return
+
         async with self._lock:
             subscribers: Iterable[asyncio.Queue[JobUpdateEvent]] = tuple(
                 self._subscribers
             )
 
         for queue in subscribers:
-            if queue.full():
-                try:
-                    queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    pass
-            queue.put_nowait(event)
+            for event in events:
+                if queue.full():
+                    try:
+                        queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        pass
+                queue.put_nowait(event)
 
 
 class MetricsHistoryBuffer:
@@ -93,3 +154,9 @@ class MetricsHistoryBuffer:
 node_event_bus = NodeEventBus()
 job_event_bus = JobEventBus()
 metrics_history_buffer = MetricsHistoryBuffer()
+
+
+def configure_sse_queue_size(queue_size: int) -> None:
+    """Set the pending-event limit for node streams opened from now on."""
+
+    node_event_bus._queue_size = queue_size
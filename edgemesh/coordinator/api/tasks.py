@@ -8,33 +8,71 @@ from models import NodeUpdateEvent
 logger = logging.getLogger("coordinator")
 
 
-async def stale_node_monitor(stale_seconds: int) -> None:
-    while True:
-        await asyncio.sleep(5)
-        stale_nodes = mark_offline_if_stale_nodes(stale_seconds)
-        for node in stale_nodes:
-            event = NodeUpdateEvent(
-                node_id=node.identity.node_id,
-                status=node.status,
-                metrics=node.metrics,
-                updated_at=node.updated_at,
-            )
-            await node_event_bus.publish(event)
-            logger.info(
-                "node_marked_offline",
-                extra={"node_id": node.identity.node_id, "status": node.status.value},
-            )
-
-
-async def stale_task_monitor(interval_seconds: int = 3) -> None:
+_OFFLINE_SCAN_INTERVAL_SECONDS = 5.0
+
+
+async def _mark_stale_nodes_offline(stale_seconds: int) -> None:
+    stale_nodes = mark_offline_if_stale_nodes(stale_seconds)
+    if not stale_nodes:
+        return
+
+    await node_event_bus.publish_many(
+        NodeUpdateEvent(
+            node_id=node.identity.node_id,
+            status=node.status,
+            metrics=node.metrics,
+            updated_at=node.updated_at,
+        )
+        for node in stale_nodes
+    )
+    logger.info(
+        "nodes_marked_offline",
+        extra={
+            "count": len(stale_nodes),
+            "node_ids": [node.identity.node_id for node in stale_nodes],
+        },
+    )
+
+
+def _recover_stale_tasks() -> None:
+    stale_tasks = recover_stale_tasks()
+    if stale_tasks:
+        logger.info(
+            "stale_tasks_recovered",
+            extra={
+                "count": len(stale_tasks),
+                "task_ids": [task.id for task in stale_tasks],
+            },
+        )
+
+
+async def housekeeping_monitor(
+    stale_seconds: int,
+    recovery_interval_seconds: float = 3,
+    offline_scan_interval_seconds: float = _OFFLINE_SCAN_INTERVAL_SECONDS,
+) -> None:
+    """Run the stale-node and stale-task sweeps from a single timer.
+
+    Each sweep keeps its own cadence; the loop sleeps until whichever is due next. A
+    failing sweep is logged and retried on its next tick without stopping the other.
+    """
+    loop = asyncio.get_running_loop()
+    next_offline_scan = loop.time() + offline_scan_interval_seconds
+    next_recovery = loop.time() + recovery_interval_seconds
+
     while True:
-        await asyncio.sleep(interval_seconds)
-        stale_tasks = recover_stale_tasks()
-        if stale_tasks:
-            logger.info(
-                "stale_tasks_recovered",
-                extra={
-                    "count": len(stale_tasks),
-                    "task_ids": [task.id for task in stale_tasks],
-                },
-            )
+        await asyncio.sleep(max(min(next_offline_scan, next_recovery) - loop.time(), 0))
+        now = loop.time()
+
+        if now >= next_recovery:
+            try:
+                _recover_stale_tasks()
+            except Exception:
+                logger.exception("stale_task_recovery_failed")
+            next_recovery = now + recovery_interval_seconds
+        if now >= next_offline_scan:
+            try:
+                await _mark_stale_nodes_offline(stale_seconds)
+            except Exception:
+                logger.exception("offline_scan_failed")
+            next_offline_scan = now + offline_scan_interval_seconds
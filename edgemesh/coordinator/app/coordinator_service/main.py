@@ -9,7 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
-from api.auth import require_agent_secret
+from api.auth import configure_agent_secret, require_agent_secret
 from api.routers import (
     agent_router,
     cluster_router,
@@ -21,13 +21,16 @@ from api.routers import (
     stream_router,
     tasks_router,
 )
+from api.routers.stream import configure_sse_keepalive
+from api.routers.tasks import configure_task_lease
 from api.services import (
     heartbeat_agent_v1,
     register_agent_v1,
     to_v1_heartbeat_from_legacy,
     to_v1_register_from_legacy,
 )
-from api.tasks import stale_node_monitor, stale_task_monitor
+from api.state import configure_sse_queue_size
+from api.tasks import housekeeping_monitor
 from coordinator_service.logging_config import configure_logging
 from coordinator_service.models import AgentRegisterRequest, AgentView, HeartbeatRequest
 from coordinator_service.settings import Settings
@@ -37,11 +40,14 @@ from models import NodeStatus
 load_dotenv()
 settings = Settings.from_env()
 configure_logging(settings.log_level)
+configure_agent_secret(settings.edge_mesh_shared_secret)
+configure_task_lease(settings.task_lease_seconds)
+configure_sse_keepalive(settings.sse_keepalive_seconds)
+configure_sse_queue_size(settings.sse_max_queue_size)
 logger = logging.getLogger("coordinator")
 
 app = FastAPI(title="edgemesh coordinator", version="0.2.0")
-_stale_monitor_task: asyncio.Task[None] | None = None
-_stale_task_monitor_task: asyncio.Task[None] | None = None
+_housekeeping_task: asyncio.Task[None] | None = None
 
 app.add_middleware(
     CORSMiddleware,
@@ -64,13 +70,12 @@ app.include_router(jobs_router)
 
 @app.on_event("startup")
 async def startup() -> None:
-    global _stale_monitor_task, _stale_task_monitor_task
+    global _housekeeping_task
     init_repository(settings.db_url)
-    _stale_monitor_task = asyncio.create_task(
-        stale_node_monitor(settings.node_stale_seconds)
-    )
-    _stale_task_monitor_task = asyncio.create_task(
-        stale_task_monitor(settings.task_recovery_interval_seconds)
+    _housekeeping_task = asyncio.create_task(
+        housekeeping_monitor(
+            settings.node_stale_seconds, settings.task_recovery_interval_seconds
+        )
     )
     logger.info(
         "repository_initialized",
@@ -80,6 +85,9 @@ async def startup() -> None:
             "offline_scan_interval_seconds": 5,
             "task_lease_seconds": settings.task_lease_seconds,
             "task_recovery_interval_seconds": settings.task_recovery_interval_seconds,
+            "sse_keepalive_seconds": settings.sse_keepalive_seconds,
+            "sse_max_queue_size": settings.sse_max_queue_size,
+            "keepalive_timeout_seconds": settings.keepalive_timeout_seconds,
             "agent_secret_enabled": bool(settings.edge_mesh_shared_secret),
         },
     )
@@ -87,19 +95,13 @@ async def startup() -> None:
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
-    global _stale_monitor_task, _stale_task_monitor_task
-
-    if _stale_monitor_task is not None:
-        _stale_monitor_task.cancel()
-        with suppress(asyncio.CancelledError):
-            await _stale_monitor_task
-        _stale_monitor_task = None
+    global _housekeeping_task
 
-    if _stale_task_monitor_task is not None:
-        _stale_task_monitor_task.cancel()
+    if _housekeeping_task is not None:
+        _housekeeping_task.cancel()
         with suppress(asyncio.CancelledError):
-            await _stale_task_monitor_task
-        _stale_task_monitor_task = None
+            await _housekeeping_task
+        _housekeeping_task = None
 
 
 @app.post("/api/agents/register", status_code=status.HTTP_201_CREATED)
@@ -194,4 +196,7 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=True,
+        # Agents poll and post over persistent connections; keep idle ones open
+        # between requests instead of uvicorn's 5s default.
+        timeout_keep_alive=settings.keepalive_timeout_seconds,
     )
@@ -7,28 +7,34 @@ class Settings:
     host: str
     port: int
     log_level: str
+    keepalive_timeout_seconds: int
     heartbeat_ttl_seconds: int
     node_stale_seconds: int
     task_lease_seconds: int
     task_recovery_interval_seconds: int
-    cors_origins: list[str]
+    sse_keepalive_seconds: float
+    sse_max_queue_size: int
+    cors_origins: frozenset[str]
     db_url: str
     edge_mesh_shared_secret: str
 
     @classmethod
     def from_env(cls) -> "Settings":
-        cors_origins = [
+        cors_origins = frozenset(
             origin.strip()
             for origin in os.getenv(
                 "COORDINATOR_CORS_ORIGINS", "http://localhost:5173"
             ).split(",")
             if origin.strip()
-        ]
+        )
 
         return cls(
             host=os.getenv("COORDINATOR_HOST", "0.0.0.0"),
             port=int(os.getenv("COORDINATOR_PORT", "8000")),
             log_level=os.getenv("COORDINATOR_LOG_LEVEL", "INFO"),
+            keepalive_timeout_seconds=int(
+                os.getenv("COORDINATOR_KEEPALIVE_TIMEOUT_SECONDS", "75")
+            ),
             heartbeat_ttl_seconds=int(
                 os.getenv("COORDINATOR_HEARTBEAT_TTL_SECONDS", "60")
             ),
@@ -37,6 +43,8 @@ class Settings:
             task_recovery_interval_seconds=int(
                 os.getenv("TASK_RECOVERY_INTERVAL_SECONDS", "3")
             ),
+            sse_keepalive_seconds=float(os.getenv("SSE_KEEPALIVE_SECONDS", "25")),
+            sse_max_queue_size=int(os.getenv("SSE_MAX_QUEUE_SIZE", "256")),
             cors_origins=cors_origins,
             db_url=os.getenv("COORDINATOR_DB_URL", "sqlite:///./coordinator.db"),
             edge_mesh_shared_secret=os.getenv("EDGE_MESH_SHARED_SECRET", "").strip(),
@@ -14,6 +14,8 @@ from db.repository import (
     mark_offline_if_stale,
     mark_offline_if_stale_nodes,
     pull_task_for_node,
+    pull_tasks_for_node,
+    record_node_heartbeat,
     recover_stale_tasks,
     submit_task_result,
     transition_job_status,
@@ -39,6 +41,8 @@ __all__ = [
     "mark_offline_if_stale",
     "mark_offline_if_stale_nodes",
     "pull_task_for_node",
+    "pull_tasks_for_node",
+    "record_node_heartbeat",
     "recover_stale_tasks",
     "submit_task_result",
     "transition_job_status",
@@ -36,6 +36,7 @@ def apply_migrations(db_url: str) -> None:
             ).fetchall()
         }
 
+        applied_any = False
         for migration_file in migration_files:
             version = migration_file.stem
             if version in applied_versions:
@@ -47,5 +48,10 @@ def apply_migrations(db_url: str) -> None:
                 "INSERT INTO schema_migrations(version) VALUES (?)",
                 (version,),
             )
+            applied_any = True
+
+        if applied_any:
+            # Refresh planner statistics so new indexes are picked up right away.
+            connection.execute("ANALYZE")
 
         connection.commit()
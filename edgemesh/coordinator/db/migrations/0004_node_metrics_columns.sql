@@ -0,0 +1,25 @@
+BEGIN;
+
+ALTER TABLE nodes ADD COLUMN cpu_percent REAL NOT NULL DEFAULT 0;
+ALTER TABLE nodes ADD COLUMN ram_used_gb REAL NOT NULL DEFAULT 0;
+ALTER TABLE nodes ADD COLUMN ram_percent REAL NOT NULL DEFAULT 0;
+ALTER TABLE nodes ADD COLUMN gpu_percent REAL;
+ALTER TABLE nodes ADD COLUMN vram_used_gb REAL;
+ALTER TABLE nodes ADD COLUMN running_jobs INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE nodes ADD COLUMN heartbeat_ts DATETIME;
+ALTER TABLE nodes ADD COLUMN extra_json TEXT NOT NULL DEFAULT '{}';
+
+-- heartbeat_ts has always been written together with last_seen.
+UPDATE nodes SET
+  cpu_percent = COALESCE(json_extract(metrics_json, '$.cpu_percent'), 0),
+  ram_used_gb = COALESCE(json_extract(metrics_json, '$.ram_used_gb'), 0),
+  ram_percent = COALESCE(json_extract(metrics_json, '$.ram_percent'), 0),
+  gpu_percent = json_extract(metrics_json, '$.gpu_percent'),
+  vram_used_gb = json_extract(metrics_json, '$.vram_used_gb'),
+  running_jobs = COALESCE(json_extract(metrics_json, '$.running_jobs'), 0),
+  heartbeat_ts = last_seen,
+  extra_json = COALESCE(json_extract(metrics_json, '$.extra'), '{}');
+
+ALTER TABLE nodes DROP COLUMN metrics_json;
+
+COMMIT;
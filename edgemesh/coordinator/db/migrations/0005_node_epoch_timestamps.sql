@@ -0,0 +1,16 @@
+BEGIN;
+
+-- Node timestamps become integer microseconds since the Unix epoch (UTC).
+-- Existing values use SQLAlchemy's 'YYYY-MM-DD HH:MM:SS.ffffff' text format.
+UPDATE nodes SET
+  last_seen = CAST(strftime('%s', last_seen) AS INTEGER) * 1000000
+    + CAST(substr(last_seen, 21, 6) AS INTEGER),
+  created_at = CAST(strftime('%s', created_at) AS INTEGER) * 1000000
+    + CAST(substr(created_at, 21, 6) AS INTEGER),
+  updated_at = CAST(strftime('%s', updated_at) AS INTEGER) * 1000000
+    + CAST(substr(updated_at, 21, 6) AS INTEGER),
+  heartbeat_ts = CAST(strftime('%s', heartbeat_ts) AS INTEGER) * 1000000
+    + CAST(substr(heartbeat_ts, 21, 6) AS INTEGER)
+WHERE typeof(last_seen) = 'text';
+
+COMMIT;
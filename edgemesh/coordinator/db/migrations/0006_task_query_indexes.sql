@@ -0,0 +1,9 @@
+BEGIN;
+
+-- Task pulls filter queued tasks by type and take the oldest first.
+CREATE INDEX IF NOT EXISTS idx_tasks_status_type_created ON tasks(status, type, created_at);
+-- Job stats group a job's tasks by status; this also serves plain job_id lookups.
+CREATE INDEX IF NOT EXISTS idx_tasks_job_status ON tasks(job_id, status);
+DROP INDEX IF EXISTS idx_tasks_job_id;
+
+COMMIT;
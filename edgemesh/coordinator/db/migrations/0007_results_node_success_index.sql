@@ -0,0 +1,7 @@
+BEGIN;
+
+-- Covers the per-node reliability GROUP BY run at startup; replaces the node_id-only index.
+CREATE INDEX IF NOT EXISTS idx_results_node_success ON results(node_id, success);
+DROP INDEX IF EXISTS idx_results_node_id;
+
+COMMIT;
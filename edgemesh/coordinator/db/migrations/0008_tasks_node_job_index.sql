@@ -0,0 +1,8 @@
+BEGIN;
+
+-- Lets the list_jobs node filter probe a job's tasks for that node with one index seek;
+-- also serves assigned_node_id-only lookups, so it replaces the single-column index.
+CREATE INDEX IF NOT EXISTS idx_tasks_node_job ON tasks(assigned_node_id, job_id);
+DROP INDEX IF EXISTS idx_tasks_assigned_node;
+
+COMMIT;
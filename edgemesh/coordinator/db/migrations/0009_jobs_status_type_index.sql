@@ -0,0 +1,7 @@
+BEGIN;
+
+-- list_jobs filters by status and optionally type; replaces the status-only index.
+CREATE INDEX IF NOT EXISTS idx_jobs_status_type ON jobs(status, type);
+DROP INDEX IF EXISTS idx_jobs_status;
+
+COMMIT;
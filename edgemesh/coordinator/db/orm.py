@@ -1,7 +1,55 @@
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import DateTime, Float, Integer, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class EpochMicroseconds(TypeDecorator[datetime]):
+    """UTC datetime stored as integer microseconds since the Unix epoch.
+
+    Used for the node columns rewritten on every heartbeat: integers skip the ISO text
+    formatting and parsing SQLite's DateTime emulation does for each value.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value: datetime | None, dialect) -> int | None:
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return (value - _EPOCH) // _MICROSECOND
+
+    def process_result_value(self, value: int | None, dialect) -> datetime | None:
+        if value is None:
+            return None
+        return _EPOCH + timedelta(microseconds=value)
+
+
+class UTCDateTime(TypeDecorator[datetime]):
+    """Datetime stored as naive UTC text and always read back as an aware UTC value.
+
+    SQLite's DateTime emulation drops tzinfo, so without this every reader had to
+    re-attach UTC itself.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value: datetime | None, dialect) -> datetime | None:
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone(UTC).replace(tzinfo=None)
+
+    def process_result_value(self, value: datetime | None, dialect) -> datetime | None:
+        if value is None:
+            return None
+        return value.replace(tzinfo=UTC)
 
 
 class Base(DeclarativeBase):
@@ -17,15 +65,20 @@ class NodeRecord(Base):
     port: Mapped[int] = mapped_column(Integer, nullable=False)
     status: Mapped[str] = mapped_column(String(32), nullable=False)
     capabilities_json: Mapped[str] = mapped_column(Text, nullable=False)
-    metrics_json: Mapped[str] = mapped_column(Text, nullable=False)
     policy_json: Mapped[str] = mapped_column(Text, nullable=False)
-    last_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
+    cpu_percent: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    ram_used_gb: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    ram_percent: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    gpu_percent: Mapped[float | None] = mapped_column(Float, nullable=True)
+    vram_used_gb: Mapped[float | None] = mapped_column(Float, nullable=True)
+    running_jobs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    heartbeat_ts: Mapped[datetime | None] = mapped_column(
+        EpochMicroseconds, nullable=True
     )
+    extra_json: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    last_seen: Mapped[datetime] = mapped_column(EpochMicroseconds, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(EpochMicroseconds, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(EpochMicroseconds, nullable=False)
 
 
 class JobRecord(Base):
@@ -37,18 +90,10 @@ class JobRecord(Base):
     payload_ref: Mapped[str | None] = mapped_column(Text, nullable=True)
     assigned_node_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
     attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
-    )
-    started_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True), nullable=True
-    )
-    completed_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True), nullable=True
-    )
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
@@ -64,20 +109,12 @@ class TaskRecord(Base):
     retries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     max_retries: Mapped[int] = mapped_column(Integer, nullable=False, default=2)
     lease_expires_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True), nullable=True
-    )
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
-    )
-    started_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True), nullable=True
-    )
-    completed_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True), nullable=True
+        UTCDateTime, nullable=True
     )
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
@@ -90,6 +127,4 @@ class ResultRecord(Base):
     success: Mapped[int] = mapped_column(Integer, nullable=False)
     output_json: Mapped[str | None] = mapped_column(Text, nullable=True)
     duration_ms: Mapped[int] = mapped_column(Integer, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
-    )
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
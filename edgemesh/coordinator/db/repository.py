@@ -1,8 +1,23 @@
-import json
-import uuid
+import os
+from collections import defaultdict
+from collections.abc import Iterable
 from datetime import datetime, timedelta, timezone
-
-from sqlalchemy import create_engine, func, or_, select
+from threading import Lock, RLock
+
+import orjson
+from sqlalchemy import (
+    Select,
+    bindparam,
+    create_engine,
+    event,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, sessionmaker
 
 from db.migrate import apply_migrations
@@ -16,6 +31,7 @@ from models import (
     NodeMetrics,
     NodePolicy,
     NodeStatus,
+    NodeUpdateEvent,
     Task,
     TaskResult,
     TaskStatus,
@@ -23,32 +39,153 @@ from models import (
 )
 from scheduler import evaluate_node_eligibility, score_node
 
+_UTC = timezone.utc
+
 
 def _utc_now() -> datetime:
-    return datetime.now(timezone.utc)
+    return datetime.now(_UTC)
+
+
+def _short_id(prefix: str) -> str:
+    return f"{prefix}-{os.urandom(6).hex()}"
 
 
 def _as_utc(dt: datetime | None) -> datetime | None:
     if dt is None:
         return None
     if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+        return dt.replace(tzinfo=_UTC)
+    return dt.astimezone(_UTC)
 
 
 def _encode_json(value: dict[str, object] | None) -> str:
-    return json.dumps(value or {}, separators=(",", ":"), default=str)
+    return orjson.dumps(
+        value or {}, default=str, option=orjson.OPT_NON_STR_KEYS
+    ).decode()
 
 
 def _decode_json(value: str | None) -> dict[str, object]:
     if not value:
         return {}
-    decoded = json.loads(value)
+    decoded = orjson.loads(value)
     if isinstance(decoded, dict):
         return decoded
     return {"value": decoded}
 
 
+# WAL lets API reads proceed while a heartbeat or lease write commits, and NORMAL sync
+# only fsyncs at checkpoints instead of on every commit.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _metrics_columns(metrics: NodeMetrics) -> dict[str, object]:
+    return {
+        "cpu_percent": metrics.cpu_percent,
+        "ram_used_gb": metrics.ram_used_gb,
+        "ram_percent": metrics.ram_percent,
+        "gpu_percent": metrics.gpu_percent,
+        "vram_used_gb": metrics.vram_used_gb,
+        "running_jobs": metrics.running_jobs,
+        "heartbeat_ts": metrics.heartbeat_ts,
+        "extra_json": _encode_json(metrics.extra),
+    }
+
+
+def _empty_job_stats() -> dict[str, object]:
+    return {
+        "total_tasks": 0,
+        "queued_tasks": 0,
+        "running_tasks": 0,
+        "completed_tasks": 0,
+        "failed_tasks": 0,
+        "total_retries": 0,
+        "assigned_nodes": [],
+        "avg_task_duration_ms": None,
+        "throughput_tasks_per_minute": None,
+        "earliest_started_at": None,
+        "latest_completed_at": None,
+    }
+
+
+def _configure_sqlite_connection(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+# Heartbeats are the hottest write. Building the statement once lets SQLAlchemy reuse
+# its compiled form, and executing it on a plain connection skips the ORM unit of work.
+_HEARTBEAT_UPDATE = (
+    update(NodeRecord)
+    .where(NodeRecord.node_id == bindparam("target_node_id"))
+    .values(
+        cpu_percent=bindparam("cpu_percent"),
+        ram_used_gb=bindparam("ram_used_gb"),
+        ram_percent=bindparam("ram_percent"),
+        gpu_percent=bindparam("gpu_percent"),
+        vram_used_gb=bindparam("vram_used_gb"),
+        running_jobs=bindparam("running_jobs"),
+        heartbeat_ts=bindparam("heartbeat_ts"),
+        extra_json=bindparam("extra_json"),
+        status=bindparam("status"),
+        last_seen=bindparam("last_seen"),
+        updated_at=bindparam("updated_at"),
+    )
+)
+
+# Fixed-shape task queries run on every pull; built once so only parameters vary.
+_QUEUED_TASKS_OF_TYPE = (
+    select(TaskRecord)
+    .where(
+        TaskRecord.status == TaskStatus.QUEUED.value,
+        TaskRecord.type == bindparam("task_type"),
+    )
+    .order_by(TaskRecord.created_at.asc())
+    .limit(bindparam("limit"))
+)
+_LEASE_EXPIRED = (
+    TaskRecord.status == TaskStatus.RUNNING.value,
+    TaskRecord.lease_expires_at.is_not(None),
+    TaskRecord.lease_expires_at < bindparam("now"),
+)
+# Expired leases are requeued while retries remain and failed once they run out;
+# each is a single UPDATE ... RETURNING instead of a per-row read-modify-write.
+_REQUEUE_EXPIRED_LEASES = (
+    update(TaskRecord)
+    .where(*_LEASE_EXPIRED, TaskRecord.retries < TaskRecord.max_retries)
+    .values(
+        retries=TaskRecord.retries + 1,
+        status=TaskStatus.QUEUED.value,
+        assigned_node_id=None,
+        lease_expires_at=None,
+        updated_at=bindparam("now"),
+        error="Task lease expired",
+    )
+    .returning(TaskRecord)
+)
+_FAIL_EXPIRED_LEASES = (
+    update(TaskRecord)
+    .where(*_LEASE_EXPIRED, TaskRecord.retries >= TaskRecord.max_retries)
+    .values(
+        retries=TaskRecord.retries + 1,
+        status=TaskStatus.FAILED.value,
+        lease_expires_at=None,
+        updated_at=bindparam("now"),
+        completed_at=bindparam("now"),
+        error="Task lease expired",
+    )
+    .returning(TaskRecord)
+)
+
 _ALLOWED_JOB_TRANSITIONS: dict[JobStatus, set[JobStatus]] = {
     JobStatus.QUEUED: {JobStatus.RUNNING},
     JobStatus.RUNNING: {JobStatus.COMPLETED, JobStatus.FAILED},
@@ -66,9 +203,42 @@ class CoordinatorRepository:
             future=True,
             connect_args={"check_same_thread": False},
         )
+        event.listen(self._engine, "connect", _configure_sqlite_connection)
         self._session_factory = sessionmaker(
             bind=self._engine, autoflush=False, expire_on_commit=False
         )
+        # Write-through copy of every node row. This process is the only writer, so reads
+        # are served from memory; node writes hold the lock across commit and cache update
+        # so the two cannot be reordered by concurrent requests.
+        self._node_lock = RLock()
+        # Default capabilities and policy never change, so encode them once for new rows.
+        self._default_capabilities_json = self._default_capabilities().model_dump_json()
+        self._default_policy_json = self._default_policy().model_dump_json()
+        self._nodes: dict[str, Node] = self._load_nodes()
+        # Per-node (successes, total, duration_ms sum) result counters, kept current by
+        # submit_task_result so the metrics endpoint never has to scan the results table.
+        self._reliability_lock = Lock()
+        self._reliability: dict[str, list[int]] = self._load_reliability()
+
+    def _load_nodes(self) -> dict[str, Node]:
+        with self._session_factory() as session:
+            rows = session.scalars(select(NodeRecord)).all()
+            return {row.node_id: self._to_node(row) for row in rows}
+
+    def _load_reliability(self) -> dict[str, list[int]]:
+        with self._session_factory() as session:
+            rows = session.execute(
+                select(
+                    ResultRecord.node_id,
+                    func.sum(ResultRecord.success),
+                    func.count(ResultRecord.id),
+                    func.sum(ResultRecord.duration_ms),
+                ).group_by(ResultRecord.node_id)
+            ).all()
+            return {
+                str(node_id): [int(success or 0), int(total or 0), int(duration or 0)]
+                for node_id, success, total, duration in rows
+            }
 
     def _default_capabilities(self) -> NodeCapabilities:
         return NodeCapabilities()
@@ -79,132 +249,195 @@ class CoordinatorRepository:
     def _default_policy(self) -> NodePolicy:
         return NodePolicy()
 
-    def _ensure_node(self, session: Session, node_id: str) -> NodeRecord:
-        node = session.get(NodeRecord, node_id)
-        if node is not None:
-            return node
+    def _upsert_node(self, node_id: str, values: dict[str, object]) -> Node:
+        """Insert-or-update a node row in one statement and refresh the cached node.
 
+        `values` is applied on conflict; a new row gets the defaults overlaid with `values`.
+        The caller must hold `_node_lock`.
+        """
         now = _utc_now()
-        node = NodeRecord(
-            node_id=node_id,
-            display_name=node_id,
-            ip="0.0.0.0",
-            port=0,
-            status=NodeStatus.UNKNOWN.value,
-            capabilities_json=_encode_json(
-                self._default_capabilities().model_dump(mode="json")
-            ),
-            metrics_json=_encode_json(self._default_metrics().model_dump(mode="json")),
-            policy_json=_encode_json(self._default_policy().model_dump(mode="json")),
-            last_seen=now,
-            created_at=now,
-            updated_at=now,
+        new_row: dict[str, object] = {
+            "node_id": node_id,
+            "display_name": node_id,
+            "ip": "0.0.0.0",
+            "port": 0,
+            "status": NodeStatus.UNKNOWN.value,
+            "capabilities_json": self._default_capabilities_json,
+            "policy_json": self._default_policy_json,
+            **_metrics_columns(self._default_metrics()),
+            "last_seen": now,
+            "created_at": now,
+            "updated_at": now,
+        }
+        new_row.update(values)
+        statement = (
+            sqlite_insert(NodeRecord)
+            .values(**new_row)
+            .on_conflict_do_update(index_elements=[NodeRecord.node_id], set_=values)
+            .returning(NodeRecord)
         )
-        session.add(node)
-        session.flush()
+
+        with self._session_factory.begin() as session:
+            row = session.scalars(
+                statement, execution_options={"populate_existing": True}
+            ).one()
+            node = self._to_node(row)
+        self._nodes[node_id] = node
         return node
 
+    # Row mappers below use model_construct: every column was validated on the way in,
+    # so re-running the validators on each read only costs CPU. JSON columns holding
+    # nested enums still go through model_validate_json to restore their types.
     def _to_node(self, row: NodeRecord) -> Node:
-        identity = NodeIdentity(
+        identity = NodeIdentity.model_construct(
             node_id=row.node_id,
             display_name=row.display_name,
             ip=row.ip,
             port=row.port,
         )
-        capabilities = NodeCapabilities.model_validate(
-            _decode_json(row.capabilities_json)
+        # Parse the stored JSON straight into the models, skipping the dict hop.
+        capabilities = NodeCapabilities.model_validate_json(
+            row.capabilities_json or "{}"
         )
-        metrics = NodeMetrics.model_validate(_decode_json(row.metrics_json))
-        policy = NodePolicy.model_validate(_decode_json(row.policy_json))
+        metrics = NodeMetrics.model_construct(
+            cpu_percent=row.cpu_percent,
+            ram_used_gb=row.ram_used_gb,
+            ram_percent=row.ram_percent,
+            gpu_percent=row.gpu_percent,
+            vram_used_gb=row.vram_used_gb,
+            running_jobs=row.running_jobs,
+            heartbeat_ts=row.heartbeat_ts or row.last_seen,
+            extra=_decode_json(row.extra_json),
+        )
+        policy = NodePolicy.model_validate_json(row.policy_json or "{}")
 
-        return Node(
+        return Node.model_construct(
             identity=identity,
             capabilities=capabilities,
             metrics=metrics,
             policy=policy,
             status=NodeStatus(row.status),
-            last_seen=_as_utc(row.last_seen) or _utc_now(),
-            created_at=_as_utc(row.created_at) or _utc_now(),
-            updated_at=_as_utc(row.updated_at) or _utc_now(),
-        )
-
-    def _task_rows_for_job(self, session: Session, job_id: str) -> list[TaskRecord]:
-        return session.scalars(
-            select(TaskRecord)
-            .where(TaskRecord.job_id == job_id)
-            .order_by(TaskRecord.created_at.asc())
-        ).all()
-
-    def _task_result_rows_for_job(
-        self, session: Session, job_id: str
-    ) -> list[ResultRecord]:
-        stmt = (
-            select(ResultRecord)
-            .join(TaskRecord, TaskRecord.id == ResultRecord.task_id)
-            .where(TaskRecord.job_id == job_id)
+            last_seen=row.last_seen,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
         )
-        return session.scalars(stmt).all()
 
     def _job_stats(self, session: Session, job_id: str) -> dict[str, object]:
-        task_rows = self._task_rows_for_job(session, job_id)
-        result_rows = self._task_result_rows_for_job(session, job_id)
-
-        total_tasks = len(task_rows)
-        queued_tasks = sum(
-            1 for row in task_rows if row.status == TaskStatus.QUEUED.value
-        )
-        running_tasks = sum(
-            1 for row in task_rows if row.status == TaskStatus.RUNNING.value
+        return self._job_stats_many(session, [job_id]).get(job_id) or _empty_job_stats()
+
+    def _job_stats_many(
+        self, session: Session, job_ids: Iterable[str] | Select
+    ) -> dict[str, dict[str, object]]:
+        """Aggregate task stats for several jobs with one grouped query per source.
+
+        `job_ids` may be a list or a SELECT of job ids. Jobs without tasks are absent from
+        the result.
+        """
+        if not isinstance(job_ids, Select):
+            job_ids = list(job_ids)
+        job_filter = TaskRecord.job_id.in_(job_ids)
+
+        counts: dict[str, dict[TaskStatus, int]] = defaultdict(
+            lambda: {status: 0 for status in TaskStatus}
         )
-        completed_tasks = sum(
-            1 for row in task_rows if row.status == TaskStatus.COMPLETED.value
-        )
-        failed_tasks = sum(
-            1 for row in task_rows if row.status == TaskStatus.FAILED.value
+        total_retries: dict[str, int] = defaultdict(int)
+        earliest_started: dict[str, datetime] = {}
+        latest_completed: dict[str, datetime] = {}
+        for (
+            job_id,
+            status_value,
+            count,
+            retries,
+            started_at,
+            completed_at,
+        ) in session.execute(
+            select(
+                TaskRecord.job_id,
+                TaskRecord.status,
+                func.count(),
+                func.sum(TaskRecord.retries),
+                func.min(TaskRecord.started_at),
+                func.max(TaskRecord.completed_at),
+            )
+            .where(job_filter)
+            .group_by(TaskRecord.job_id, TaskRecord.status)
+        ):
+            counts[job_id][TaskStatus(status_value)] = int(count)
+            total_retries[job_id] += int(retries or 0)
+            if started_at is not None and (
+                job_id not in earliest_started or started_at < earliest_started[job_id]
+            ):
+                earliest_started[job_id] = started_at
+            if completed_at is not None and (
+                job_id not in latest_completed
+                or completed_at > latest_completed[job_id]
+            ):
+                latest_completed[job_id] = completed_at
+
+        assigned_nodes: dict[str, list[str]] = defaultdict(list)
+        for job_id, assigned_node_id in session.execute(
+            select(TaskRecord.job_id, TaskRecord.assigned_node_id)
+            .where(
+                job_filter,
+                TaskRecord.assigned_node_id.is_not(None),
+                TaskRecord.assigned_node_id != "",
+            )
+            .distinct()
+            .order_by(TaskRecord.job_id, TaskRecord.assigned_node_id)
+        ):
+            assigned_nodes[job_id].append(assigned_node_id)
+
+        avg_durations: dict[str, float] = dict(
+            session.execute(
+                select(TaskRecord.job_id, func.avg(ResultRecord.duration_ms))
+                .join(TaskRecord, TaskRecord.id == ResultRecord.task_id)
+                .where(job_filter)
+                .group_by(TaskRecord.job_id)
+            ).all()
         )
-        total_retries = sum(row.retries for row in task_rows)
 
-        assigned_nodes = sorted(
-            {
-                row.assigned_node_id
-                for row in task_rows
-                if row.assigned_node_id is not None and row.assigned_node_id != ""
-            }
-        )
+        now = _utc_now()
+        stats: dict[str, dict[str, object]] = {}
+        for job_id, job_counts in counts.items():
+            completed_tasks = job_counts[TaskStatus.COMPLETED]
+
+            throughput_tasks_per_minute: float | None = None
+            started = earliest_started.get(job_id)
+            if completed_tasks > 0 and started is not None:
+                elapsed_minutes = max((now - started).total_seconds() / 60.0, 1e-6)
+                throughput_tasks_per_minute = round(
+                    completed_tasks / elapsed_minutes, 3
+                )
 
-        avg_task_duration_ms: float | None = None
-        if result_rows:
-            avg_task_duration_ms = round(
-                sum(row.duration_ms for row in result_rows) / len(result_rows), 3
-            )
+            avg_duration_ms = avg_durations.get(job_id)
+            stats[job_id] = {
+                "total_tasks": sum(job_counts.values()),
+                "queued_tasks": job_counts[TaskStatus.QUEUED],
+                "running_tasks": job_counts[TaskStatus.RUNNING],
+                "completed_tasks": completed_tasks,
+                "failed_tasks": job_counts[TaskStatus.FAILED],
+                "total_retries": total_retries[job_id],
+                "assigned_nodes": assigned_nodes[job_id],
+                "avg_task_duration_ms": (
+                    round(float(avg_duration_ms), 3)
+                    if avg_duration_ms is not None
+                    else None
+                ),
+                "throughput_tasks_per_minute": throughput_tasks_per_minute,
+                "earliest_started_at": started,
+                "latest_completed_at": latest_completed.get(job_id),
+            }
+        return stats
 
-        throughput_tasks_per_minute: float | None = None
-        started_candidates = [
-            _as_utc(row.started_at)
-            for row in task_rows
-            if _as_utc(row.started_at) is not None
-        ]
-        if completed_tasks > 0 and started_candidates:
-            earliest_started = min(started_candidates)
-            now = _utc_now()
-            elapsed_minutes = max((now - earliest_started).total_seconds() / 60.0, 1e-6)
-            throughput_tasks_per_minute = round(completed_tasks / elapsed_minutes, 3)
+    def _refresh_job_state_locked(
+        self, session: Session, job_id: str, now: datetime
+    ) -> tuple[JobRecord, dict[str, object]] | None:
+        """Recompute a job's status from its tasks.
 
-        return {
-            "total_tasks": total_tasks,
-            "queued_tasks": queued_tasks,
-            "running_tasks": running_tasks,
-            "completed_tasks": completed_tasks,
-            "failed_tasks": failed_tasks,
-            "total_retries": total_retries,
-            "assigned_nodes": assigned_nodes,
-            "avg_task_duration_ms": avg_task_duration_ms,
-            "throughput_tasks_per_minute": throughput_tasks_per_minute,
-        }
+        Returns the updated row with the stats it was derived from, so callers can build
+        the `Job` view without querying the same aggregates again.
+        """
 
-    def _refresh_job_state_locked(
-        self, session: Session, job_id: str
-    ) -> JobRecord | None:
         row = session.get(JobRecord, job_id)
         if row is None:
             return None
@@ -216,7 +449,6 @@ class CoordinatorRepository:
         completed_tasks = int(stats["completed_tasks"])
         failed_tasks = int(stats["failed_tasks"])
 
-        now = _utc_now()
         status = JobStatus(row.status)
         if total_tasks > 0:
             if completed_tasks == total_tasks:
@@ -235,23 +467,17 @@ class CoordinatorRepository:
         assigned_nodes = list(stats["assigned_nodes"])
         row.assigned_node_id = assigned_nodes[0] if assigned_nodes else None
 
-        task_rows = self._task_rows_for_job(session, job_id)
-        started_values = [
-            _as_utc(item.started_at)
-            for item in task_rows
-            if _as_utc(item.started_at) is not None
-        ]
-        completed_values = [
-            _as_utc(item.completed_at)
-            for item in task_rows
-            if _as_utc(item.completed_at) is not None
-        ]
+        earliest_started_at = stats["earliest_started_at"]
+        latest_completed_at = stats["latest_completed_at"]
 
-        if started_values and row.started_at is None:
-            row.started_at = min(started_values)
+        if earliest_started_at is not None and row.started_at is None:
+            row.started_at = earliest_started_at
 
-        if status in {JobStatus.COMPLETED, JobStatus.FAILED} and completed_values:
-            row.completed_at = max(completed_values)
+        if (
+            status in {JobStatus.COMPLETED, JobStatus.FAILED}
+            and latest_completed_at is not None
+        ):
+            row.completed_at = latest_completed_at
         elif status not in {JobStatus.COMPLETED, JobStatus.FAILED}:
             row.completed_at = None
 
@@ -260,23 +486,29 @@ class CoordinatorRepository:
         elif status == JobStatus.COMPLETED:
             row.error = None
 
-        session.flush()
-        return row
+        # The row is flushed with the surrounding transaction; stats only read the tasks.
+        return row, stats
 
-    def _to_job(self, session: Session, row: JobRecord) -> Job:
-        stats = self._job_stats(session, row.id)
+    def _to_job(
+        self,
+        session: Session,
+        row: JobRecord,
+        stats: dict[str, object] | None = None,
+    ) -> Job:
+        if stats is None:
+            stats = self._job_stats(session, row.id)
 
-        return Job(
+        return Job.model_construct(
             id=row.id,
             type=TaskType(row.type),
             status=JobStatus(row.status),
             payload_ref=row.payload_ref,
             assigned_node_id=row.assigned_node_id,
             attempts=row.attempts,
-            created_at=_as_utc(row.created_at) or _utc_now(),
-            updated_at=_as_utc(row.updated_at) or _utc_now(),
-            started_at=_as_utc(row.started_at),
-            completed_at=_as_utc(row.completed_at),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            started_at=row.started_at,
+            completed_at=row.completed_at,
             error=row.error,
             total_tasks=int(stats["total_tasks"]),
             queued_tasks=int(stats["queued_tasks"]),
@@ -298,7 +530,7 @@ class CoordinatorRepository:
         )
 
     def _to_task(self, row: TaskRecord) -> Task:
-        return Task(
+        return Task.model_construct(
             id=row.id,
             job_id=row.job_id,
             type=TaskType(row.type),
@@ -307,99 +539,160 @@ class CoordinatorRepository:
             assigned_node_id=row.assigned_node_id,
             retries=row.retries,
             max_retries=row.max_retries,
-            lease_expires_at=_as_utc(row.lease_expires_at),
-            created_at=_as_utc(row.created_at) or _utc_now(),
-            updated_at=_as_utc(row.updated_at) or _utc_now(),
-            started_at=_as_utc(row.started_at),
-            completed_at=_as_utc(row.completed_at),
+            lease_expires_at=row.lease_expires_at,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            started_at=row.started_at,
+            completed_at=row.completed_at,
             error=row.error,
         )
 
     def upsert_node_identity(
         self, node_id: str, display_name: str, ip: str, port: int
     ) -> Node:
-        now = _utc_now()
-        with self._session_factory.begin() as session:
-            node = self._ensure_node(session, node_id)
-            node.display_name = display_name
-            node.ip = ip
-            node.port = port
-            node.updated_at = now
-            session.flush()
-            return self._to_node(node)
+        with self._node_lock:
+            return self._upsert_node(
+                node_id,
+                {
+                    "display_name": display_name,
+                    "ip": ip,
+                    "port": port,
+                    "updated_at": _utc_now(),
+                },
+            )
 
     def upsert_node_capabilities(
         self, node_id: str, capabilities: NodeCapabilities | dict[str, object]
     ) -> Node:
-        now = _utc_now()
-        payload = NodeCapabilities.model_validate(capabilities)
+        payload = (
+            capabilities
+            if isinstance(capabilities, NodeCapabilities)
+            else NodeCapabilities.model_validate(capabilities)
+        )
 
-        with self._session_factory.begin() as session:
-            node = self._ensure_node(session, node_id)
-            node.capabilities_json = _encode_json(payload.model_dump(mode="json"))
-            node.updated_at = now
-            session.flush()
-            return self._to_node(node)
+        with self._node_lock:
+            return self._upsert_node(
+                node_id,
+                {
+                    "capabilities_json": payload.model_dump_json(),
+                    "updated_at": _utc_now(),
+                },
+            )
 
     def update_node_metrics(
         self, node_id: str, metrics: NodeMetrics | dict[str, object]
     ) -> Node:
+        payload = (
+            metrics
+            if isinstance(metrics, NodeMetrics)
+            else NodeMetrics.model_validate(metrics)
+        )
+
+        with self._node_lock:
+            return self._upsert_node(
+                node_id,
+                {
+                    **_metrics_columns(payload),
+                    "status": NodeStatus.ONLINE.value,
+                    "last_seen": payload.heartbeat_ts,
+                    "updated_at": _utc_now(),
+                },
+            )
+
+    def record_node_heartbeat(
+        self, node_id: str, metrics: NodeMetrics | dict[str, object]
+    ) -> NodeUpdateEvent:
+        """Store heartbeat metrics without loading or re-parsing the rest of the node row."""
         now = _utc_now()
-        payload = NodeMetrics.model_validate(metrics)
+        payload = (
+            metrics
+            if isinstance(metrics, NodeMetrics)
+            else NodeMetrics.model_validate(metrics)
+        )
+        values = {
+            **_metrics_columns(payload),
+            "status": NodeStatus.ONLINE.value,
+            "last_seen": payload.heartbeat_ts,
+            "updated_at": now,
+        }
 
-        with self._session_factory.begin() as session:
-            node = self._ensure_node(session, node_id)
-            node.metrics_json = _encode_json(payload.model_dump(mode="json"))
-            node.status = NodeStatus.ONLINE.value
-            node.last_seen = payload.heartbeat_ts
-            node.updated_at = now
-            session.flush()
-            return self._to_node(node)
+        with self._node_lock:
+            cached = self._nodes.get(node_id)
+            if cached is None:
+                self._upsert_node(node_id, values)
+            else:
+                with self._engine.begin() as connection:
+                    connection.execute(
+                        _HEARTBEAT_UPDATE, {"target_node_id": node_id, **values}
+                    )
+                self._nodes[node_id] = cached.model_copy(
+                    update={
+                        "metrics": payload,
+                        "status": NodeStatus.ONLINE,
+                        "last_seen": _as_utc(payload.heartbeat_ts),
+                        "updated_at": now,
+                    }
+                )
+
+        return NodeUpdateEvent(
+            node_id=node_id,
+            status=NodeStatus.ONLINE,
+            metrics=payload,
+            updated_at=now,
+        )
 
     def get_nodes(self) -> list[Node]:
-        with self._session_factory() as session:
-            rows = session.scalars(
-                select(NodeRecord).order_by(NodeRecord.node_id.asc())
-            ).all()
-            return [self._to_node(row) for row in rows]
+        with self._node_lock:
+            return [self._nodes[node_id] for node_id in sorted(self._nodes)]
 
     def get_node(self, node_id: str) -> Node | None:
-        with self._session_factory() as session:
-            row = session.get(NodeRecord, node_id)
-            if row is None:
-                return None
-            return self._to_node(row)
+        with self._node_lock:
+            return self._nodes.get(node_id)
 
     def update_node_policy(
         self, node_id: str, policy: NodePolicy | dict[str, object]
     ) -> Node:
-        now = _utc_now()
-        payload = NodePolicy.model_validate(policy)
+        payload = (
+            policy
+            if isinstance(policy, NodePolicy)
+            else NodePolicy.model_validate(policy)
+        )
 
-        with self._session_factory.begin() as session:
-            node = self._ensure_node(session, node_id)
-            node.policy_json = _encode_json(payload.model_dump(mode="json"))
-            node.updated_at = now
-            session.flush()
-            return self._to_node(node)
+        with self._node_lock:
+            return self._upsert_node(
+                node_id,
+                {"policy_json": payload.model_dump_json(), "updated_at": _utc_now()},
+            )
 
     def mark_offline_if_stale_nodes(self, stale_seconds: int) -> list[Node]:
         now = _utc_now()
         cutoff = now - timedelta(seconds=stale_seconds)
-        updated_nodes: list[Node] = []
 
-        with self._session_factory.begin() as session:
-            rows = session.scalars(select(NodeRecord)).all()
-            for node in rows:
-                if (
-                    _as_utc(node.last_seen) or now
-                ) < cutoff and node.status != NodeStatus.OFFLINE.value:
-                    node.status = NodeStatus.OFFLINE.value
-                    node.updated_at = now
-                    session.flush()
-                    updated_nodes.append(self._to_node(node))
+        with self._node_lock:
+            stale_ids = [
+                node.identity.node_id
+                for node in self._nodes.values()
+                if node.last_seen < cutoff and node.status != NodeStatus.OFFLINE
+            ]
+            if not stale_ids:
+                return []
+
+            with self._session_factory.begin() as session:
+                session.execute(
+                    update(NodeRecord)
+                    .where(NodeRecord.node_id.in_(stale_ids))
+                    .values(status=NodeStatus.OFFLINE.value, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
 
-        return updated_nodes
+            updated_nodes: list[Node] = []
+            for node_id in stale_ids:
+                updated = self._nodes[node_id].model_copy(
+                    update={"status": NodeStatus.OFFLINE, "updated_at": now}
+                )
+                self._nodes[node_id] = updated
+                updated_nodes.append(updated)
+            return updated_nodes
 
     def mark_offline_if_stale(self, stale_seconds: int) -> int:
         return len(self.mark_offline_if_stale_nodes(stale_seconds=stale_seconds))
@@ -421,7 +714,6 @@ class CoordinatorRepository:
                 error=payload.error,
             )
             session.add(row)
-            session.flush()
             return self._to_job(session, row)
 
     def list_jobs(
@@ -436,20 +728,32 @@ class CoordinatorRepository:
         if task_type is not None:
             stmt = stmt.where(JobRecord.type == task_type.value)
         if node_id is not None:
-            task_subquery = select(TaskRecord.job_id).where(
-                TaskRecord.assigned_node_id == node_id
-            )
+            # Correlated EXISTS stops at the first matching task per job
+            # (idx_tasks_node_job) instead of materializing every task for the node.
             stmt = stmt.where(
                 or_(
                     JobRecord.assigned_node_id == node_id,
-                    JobRecord.id.in_(task_subquery),
+                    exists().where(
+                        TaskRecord.job_id == JobRecord.id,
+                        TaskRecord.assigned_node_id == node_id,
+                    ),
                 )
             )
         stmt = stmt.order_by(JobRecord.created_at.desc(), JobRecord.id.asc())
 
         with self._session_factory() as session:
             rows = session.scalars(stmt).all()
-            return [self._to_job(session, row) for row in rows]
+            if not rows:
+                return []
+            stats_by_job = self._job_stats_many(
+                session, stmt.with_only_columns(JobRecord.id).order_by(None)
+            )
+            return [
+                self._to_job(
+                    session, row, stats_by_job.get(row.id) or _empty_job_stats()
+                )
+                for row in rows
+            ]
 
     def get_job(self, job_id: str) -> Job | None:
         with self._session_factory() as session:
@@ -466,7 +770,6 @@ class CoordinatorRepository:
                 raise KeyError(job_id)
             row.assigned_node_id = node_id
             row.updated_at = now
-            session.flush()
             return self._to_job(session, row)
 
     def transition_job_status(
@@ -484,7 +787,6 @@ class CoordinatorRepository:
                 if error is not None:
                     row.error = error
                     row.updated_at = now
-                    session.flush()
                 return self._to_job(session, row)
 
             if new_status not in _ALLOWED_JOB_TRANSITIONS[current_status]:
@@ -506,7 +808,6 @@ class CoordinatorRepository:
                 row.completed_at = now
                 row.error = error or row.error or "Job failed"
 
-            session.flush()
             return self._to_job(session, row)
 
     def create_tasks(
@@ -522,14 +823,36 @@ class CoordinatorRepository:
             if job is None:
                 raise KeyError(job_id)
 
-            created: list[Task] = []
-            for payload in payloads:
-                row = TaskRecord(
-                    id=f"task-{uuid.uuid4().hex[:12]}",
+            rows = [
+                {
+                    "id": _short_id("task"),
+                    "job_id": job_id,
+                    "type": task_type.value,
+                    "payload_json": _encode_json(payload),
+                    "status": TaskStatus.QUEUED.value,
+                    "assigned_node_id": None,
+                    "retries": 0,
+                    "max_retries": max_retries,
+                    "lease_expires_at": None,
+                    "created_at": now,
+                    "updated_at": now,
+                    "started_at": None,
+                    "completed_at": None,
+                    "error": None,
+                }
+                for payload in payloads
+            ]
+            # Bulk INSERT from plain dicts: SQLAlchemy batches them into multi-VALUES
+            # statements without building or tracking a TaskRecord per task.
+            if rows:
+                session.execute(insert(TaskRecord), rows)
+            created = [
+                Task.model_construct(
+                    id=row["id"],
                     job_id=job_id,
-                    type=task_type.value,
-                    payload_json=_encode_json(payload),
-                    status=TaskStatus.QUEUED.value,
+                    type=task_type,
+                    payload=_decode_json(row["payload_json"]),
+                    status=TaskStatus.QUEUED,
                     assigned_node_id=None,
                     retries=0,
                     max_retries=max_retries,
@@ -540,11 +863,10 @@ class CoordinatorRepository:
                     completed_at=None,
                     error=None,
                 )
-                session.add(row)
-                session.flush()
-                created.append(self._to_task(row))
+                for row in rows
+            ]
 
-            self._refresh_job_state_locked(session, job_id)
+            self._refresh_job_state_locked(session, job_id, now)
             return created
 
     def list_tasks(
@@ -574,97 +896,91 @@ class CoordinatorRepository:
             return self._to_task(row)
 
     def pull_task_for_node(self, node_id: str, lease_seconds: int) -> Task | None:
+        tasks = self.pull_tasks_for_node(node_id, lease_seconds, max_tasks=1)
+        return tasks[0] if tasks else None
+
+    def pull_tasks_for_node(
+        self, node_id: str, lease_seconds: int, max_tasks: int = 1
+    ) -> list[Task]:
         now = _utc_now()
         lease_expires_at = now + timedelta(seconds=lease_seconds)
 
         with self._session_factory.begin() as session:
             self._recover_stale_tasks_locked(session, now)
 
-            node_row = session.get(NodeRecord, node_id)
-            if node_row is None:
-                return None
-            node = self._to_node(node_row)
-
-            queued_rows = session.scalars(
-                select(TaskRecord)
-                .where(TaskRecord.status == TaskStatus.QUEUED.value)
-                .order_by(TaskRecord.created_at.asc())
-            ).all()
-
-            selected_row: TaskRecord | None = None
-            selected_score: float | None = None
+            node = self.get_node(node_id)
+            if node is None:
+                return []
 
-            for row in queued_rows:
-                task_type = TaskType(row.type)
-                eligible, _ = evaluate_node_eligibility(node, task_type)
-                if not eligible:
-                    continue
-
-                score = score_node(node, task_type)
-                age_bonus = max(
-                    (now - (_as_utc(row.created_at) or now)).total_seconds() / 30.0, 0.0
+            limit = max(max_tasks, 0)
+            # Keyed by the stored type string so rows are scored without building enums.
+            type_scores = {
+                task_type.value: score_node(node, task_type)
+                for task_type in TaskType
+                if evaluate_node_eligibility(node, task_type)[0]
+            }
+            if limit == 0 or not type_scores:
+                return []
+
+            # A task's rank is its type's score plus an age bonus, so within a type the
+            # oldest tasks always rank first. The overall top N is therefore among the
+            # oldest N of each eligible type; only those rows need to be loaded.
+            queued_rows: list[TaskRecord] = []
+            for task_type in type_scores:
+                queued_rows.extend(
+                    session.scalars(
+                        _QUEUED_TASKS_OF_TYPE,
+                        {"task_type": task_type, "limit": limit},
+                    )
                 )
-                weighted_score = score + age_bonus
+            queued_rows.sort(key=lambda row: row.created_at)
 
-                if (
-                    selected_row is None
-                    or selected_score is None
-                    or weighted_score > selected_score
-                ):
-                    selected_row = row
-                    selected_score = weighted_score
-
-            if selected_row is None:
-                return None
-
-            selected_row.status = TaskStatus.RUNNING.value
-            selected_row.assigned_node_id = node_id
-            selected_row.lease_expires_at = lease_expires_at
-            selected_row.started_at = selected_row.started_at or now
-            selected_row.updated_at = now
-
-            job_row = session.get(JobRecord, selected_row.job_id)
-            if job_row is not None:
-                job_row.status = JobStatus.RUNNING.value
-                job_row.assigned_node_id = node_id
-                job_row.started_at = job_row.started_at or now
-                job_row.updated_at = now
+            candidates: list[tuple[float, TaskRecord]] = []
+            for row in queued_rows:
+                age_bonus = max((now - row.created_at).total_seconds() / 30.0, 0.0)
+                candidates.append((type_scores[row.type] + age_bonus, row))
+
+            # Stable sort keeps the oldest task first among equal scores.
+            candidates.sort(key=lambda item: item[0], reverse=True)
+            selected_rows = [row for _, row in candidates[:limit]]
+            if not selected_rows:
+                return []
+
+            touched_jobs: list[str] = []
+            for selected_row in selected_rows:
+                selected_row.status = TaskStatus.RUNNING.value
+                selected_row.assigned_node_id = node_id
+                selected_row.lease_expires_at = lease_expires_at
+                selected_row.started_at = selected_row.started_at or now
+                selected_row.updated_at = now
+                if selected_row.job_id not in touched_jobs:
+                    touched_jobs.append(selected_row.job_id)
+
+            for job_id in touched_jobs:
+                job_row = session.get(JobRecord, job_id)
+                if job_row is not None:
+                    job_row.status = JobStatus.RUNNING.value
+                    job_row.assigned_node_id = node_id
+                    job_row.started_at = job_row.started_at or now
+                    job_row.updated_at = now
 
             session.flush()
-            self._refresh_job_state_locked(session, selected_row.job_id)
-            return self._to_task(selected_row)
+            for job_id in touched_jobs:
+                self._refresh_job_state_locked(session, job_id, now)
+            return [self._to_task(row) for row in selected_rows]
 
     def _recover_stale_tasks_locked(
         self, session: Session, now: datetime
     ) -> list[TaskRecord]:
-        stale_rows = session.scalars(
-            select(TaskRecord).where(
-                TaskRecord.status == TaskStatus.RUNNING.value,
-                TaskRecord.lease_expires_at.is_not(None),
-                TaskRecord.lease_expires_at < now,
-            )
-        ).all()
-
-        touched_jobs: set[str] = set()
-        for row in stale_rows:
-            row.retries += 1
-            row.lease_expires_at = None
-            row.updated_at = now
-            row.error = "Task lease expired"
-
-            if row.retries > row.max_retries:
-                row.status = TaskStatus.FAILED.value
-                row.completed_at = now
-            else:
-                row.status = TaskStatus.QUEUED.value
-                row.assigned_node_id = None
-
-            touched_jobs.add(row.job_id)
+        params = {"now": now}
+        stale_rows = [
+            *session.scalars(_REQUEUE_EXPIRED_LEASES, params),
+            *session.scalars(_FAIL_EXPIRED_LEASES, params),
+        ]
 
-        for job_id in touched_jobs:
-            self._refresh_job_state_locked(session, job_id)
+        for job_id in {row.job_id for row in stale_rows}:
+            self._refresh_job_state_locked(session, job_id, now)
 
-        session.flush()
         return stale_rows
 
     def recover_stale_tasks(self) -> list[Task]:
@@ -724,65 +1040,54 @@ class CoordinatorRepository:
                     row.error = "Task execution failed; requeued"
 
             session.flush()
-            refreshed_job = self._refresh_job_state_locked(session, row.job_id)
-            if refreshed_job is None:
+            refreshed = self._refresh_job_state_locked(session, row.job_id, now)
+            if refreshed is None:
                 raise KeyError(row.job_id)
 
-            return (self._to_task(row), self._to_job(session, refreshed_job))
+            job_row, job_stats = refreshed
+            submitted = (self._to_task(row), self._to_job(session, job_row, job_stats))
+
+        with self._reliability_lock:
+            counts = self._reliability.setdefault(payload.node_id, [0, 0, 0])
+            counts[0] += 1 if payload.success else 0
+            counts[1] += 1
+            counts[2] += payload.duration_ms
+        return submitted
 
     def get_execution_metrics(self) -> dict[str, object]:
-        now = _utc_now()
-        five_minutes_ago = now - timedelta(minutes=5)
+        five_minutes_ago = _utc_now() - timedelta(minutes=5)
 
         with self._session_factory() as session:
-            total_results = session.scalar(select(func.count(ResultRecord.id))) or 0
-            success_results = (
-                session.scalar(
-                    select(func.count(ResultRecord.id)).where(ResultRecord.success == 1)
-                )
-                or 0
-            )
-            failed_results = int(total_results) - int(success_results)
-
-            avg_duration_ms = session.scalar(select(func.avg(ResultRecord.duration_ms)))
-            recent_completed = (
-                session.scalar(
-                    select(func.count(ResultRecord.id)).where(
-                        ResultRecord.created_at >= five_minutes_ago
-                    )
+            # Only the recent window touches the table, as a range scan on
+            # idx_results_created_at; lifetime totals come from the in-memory counters.
+            recent_completed = session.scalar(
+                select(func.count(ResultRecord.id)).where(
+                    ResultRecord.created_at >= five_minutes_ago
                 )
-                or 0
             )
-            throughput_per_minute = round(float(recent_completed) / 5.0, 3)
 
-            node_rows = session.execute(
-                select(
-                    ResultRecord.node_id,
-                    func.count(ResultRecord.id).label("total"),
-                    func.sum(ResultRecord.success).label("success"),
-                ).group_by(ResultRecord.node_id)
-            ).all()
+        with self._reliability_lock:
+            counters = [tuple(counts) for counts in self._reliability.values()]
+            node_reliability = {
+                node_id: round(success / total, 3)
+                for node_id, (success, total, _) in self._reliability.items()
+                if total > 0
+            }
 
-            node_reliability: dict[str, float] = {}
-            for node_id, total, success in node_rows:
-                total_count = int(total or 0)
-                success_count = int(success or 0)
-                if total_count <= 0:
-                    continue
-                node_reliability[str(node_id)] = round(success_count / total_count, 3)
+        success_results = sum(success for success, _, _ in counters)
+        total_results = sum(total for _, total, _ in counters)
+        total_duration_ms = sum(duration for _, _, duration in counters)
 
-            return {
-                "total_results": int(total_results),
-                "success_results": int(success_results),
-                "failed_results": int(failed_results),
-                "avg_duration_ms": (
-                    round(float(avg_duration_ms), 3)
-                    if avg_duration_ms is not None
-                    else None
-                ),
-                "throughput_tasks_per_minute": throughput_per_minute,
-                "node_reliability": node_reliability,
-            }
+        return {
+            "total_results": total_results,
+            "success_results": success_results,
+            "failed_results": total_results - success_results,
+            "avg_duration_ms": (
+                round(total_duration_ms / total_results, 3) if total_results else None
+            ),
+            "throughput_tasks_per_minute": round(float(recent_completed or 0) / 5.0, 3),
+            "node_reliability": node_reliability,
+        }
 
     def close(self) -> None:
         self._engine.dispose()
@@ -825,6 +1130,12 @@ def get_node(node_id: str) -> Node | None:
     return get_repository().get_node(node_id)
 
 
+def record_node_heartbeat(
+    node_id: str, metrics: NodeMetrics | dict[str, object]
+) -> NodeUpdateEvent:
+    return get_repository().record_node_heartbeat(node_id, metrics)
+
+
 def update_node_policy(node_id: str, policy: NodePolicy | dict[str, object]) -> Node:
     return get_repository().update_node_policy(node_id, policy)
 
@@ -896,6 +1207,14 @@ def pull_task_for_node(node_id: str, lease_seconds: int) -> Task | None:
     )
 
 
+def pull_tasks_for_node(
+    node_id: str, lease_seconds: int, max_tasks: int = 1
+) -> list[Task]:
+    return get_repository().pull_tasks_for_node(
+        node_id=node_id, lease_seconds=lease_seconds, max_tasks=max_tasks
+    )
+
+
 def recover_stale_tasks() -> list[Task]:
     return get_repository().recover_stale_tasks()
 
@@ -3,6 +3,7 @@ from scheduler.core import (
     compute_effective_capacity,
     evaluate_node_eligibility,
     is_node_eligible,
+    rank_nodes,
     score_node,
 )
 
@@ -11,5 +12,6 @@ __all__ = [
     "compute_effective_capacity",
     "evaluate_node_eligibility",
     "is_node_eligible",
+    "rank_nodes",
     "score_node",
 ]
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 from models import Node, NodeStatus, RolePreference, TaskType
@@ -24,29 +25,35 @@ _SCORE_WEIGHTS = {
 }
 
 
+# Enum members are not compile-time constants, so set literals of them would be rebuilt
+# on every call; build them once.
+_CPU_TASK_TYPES = frozenset(
+    {TaskType.EMBEDDINGS, TaskType.INDEX, TaskType.TOKENIZE, TaskType.PREPROCESS}
+)
+_INFER_ROLES = frozenset({RolePreference.AUTO, RolePreference.PREFER_INFERENCE})
+_CPU_ROLES = frozenset(
+    {
+        RolePreference.AUTO,
+        RolePreference.PREFER_EMBEDDINGS,
+        RolePreference.PREFER_PREPROCESS,
+    }
+)
+
+
 def _task_requires_gpu(task_type: TaskType) -> bool:
     return task_type == TaskType.INFERENCE
 
 
 def _task_prefers_cpu(task_type: TaskType) -> bool:
-    return task_type in {
-        TaskType.EMBEDDINGS,
-        TaskType.INDEX,
-        TaskType.TOKENIZE,
-        TaskType.PREPROCESS,
-    }
+    return task_type in _CPU_TASK_TYPES
 
 
 def _infer_role_match(role: RolePreference) -> bool:
-    return role in {RolePreference.AUTO, RolePreference.PREFER_INFERENCE}
+    return role in _INFER_ROLES
 
 
 def _cpu_role_match(role: RolePreference) -> bool:
-    return role in {
-        RolePreference.AUTO,
-        RolePreference.PREFER_EMBEDDINGS,
-        RolePreference.PREFER_PREPROCESS,
-    }
+    return role in _CPU_ROLES
 
 
 def compute_effective_capacity(node: Node) -> EffectiveCapacity:
@@ -119,6 +126,28 @@ def _headroom(percent: float, cap_percent: int) -> float:
 
 
 def score_node(node: Node, task_type: TaskType) -> float:
+    return _score(node, _task_requires_gpu(task_type), _task_prefers_cpu(task_type))
+
+
+def rank_nodes(nodes: Iterable[Node], task_type: TaskType) -> list[tuple[str, float]]:
+    """Score every eligible node for `task_type`, best first.
+
+    The task-type checks are resolved once for the whole batch instead of per node.
+    Nodes with equal scores keep their input order.
+    """
+
+    requires_gpu = _task_requires_gpu(task_type)
+    prefers_cpu = _task_prefers_cpu(task_type)
+    ranked = [
+        (node.identity.node_id, _score(node, requires_gpu, prefers_cpu))
+        for node in nodes
+        if evaluate_node_eligibility(node, task_type)[0]
+    ]
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked
+
+
+def _score(node: Node, requires_gpu: bool, prefers_cpu: bool) -> float:
     score = 0.0
 
     score += (
@@ -130,7 +159,7 @@ def score_node(node: Node, task_type: TaskType) -> float:
         * _SCORE_WEIGHTS["ram_headroom"]
     )
 
-    if _task_requires_gpu(task_type):
+    if requires_gpu:
         if node.capabilities.has_gpu:
             score += _SCORE_WEIGHTS["infer_gpu_bonus"]
 
@@ -150,7 +179,7 @@ def score_node(node: Node, task_type: TaskType) -> float:
         else:
             score -= _SCORE_WEIGHTS["role_mismatch_penalty"]
 
-    if _task_prefers_cpu(task_type):
+    if prefers_cpu:
         if not node.capabilities.has_gpu:
             score += _SCORE_WEIGHTS["cpu_task_cpu_node_bonus"]
 
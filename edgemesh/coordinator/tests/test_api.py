@@ -463,10 +463,84 @@ def test_tasks_pull_submit_and_job_completion(client: TestClient) -> None:
     assert metrics_payload["success_results"] >= 2
 
 
-def test_task_retry_and_reassignment(
-    client: TestClient, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    monkeypatch.setenv("TASK_LEASE_SECONDS", "1")
+def test_tasks_pull_batch_leases_multiple_tasks(client: TestClient) -> None:
+    _register_agent_v1(client, node_id="worker-a", has_gpu=False)
+    _heartbeat_agent_v1(client, node_id="worker-a", cpu_percent=9.0)
+
+    created = client.post(
+        "/v1/jobs",
+        json={"task_type": "EMBED", "payload_ref": "demo://batch", "task_count": 3},
+    )
+    assert created.status_code == 201
+
+    pulled = client.post(
+        "/v1/tasks/pull",
+        headers=_agent_headers(),
+        json={"node_id": "worker-a", "max_tasks": 2},
+    )
+    assert pulled.status_code == 200
+    payload = pulled.json()
+    assert len(payload["tasks"]) == 2
+    assert payload["task"]["id"] == payload["tasks"][0]["id"]
+    assert all(task["status"] == "RUNNING" for task in payload["tasks"])
+
+    remaining = client.post(
+        "/v1/tasks/pull",
+        headers=_agent_headers(),
+        json={"node_id": "worker-a", "max_tasks": 5},
+    )
+    assert len(remaining.json()["tasks"]) == 1
+
+
+def test_tasks_results_batch_reports_rejections(client: TestClient) -> None:
+    _register_agent_v1(client, node_id="worker-a", has_gpu=False)
+    _heartbeat_agent_v1(client, node_id="worker-a", cpu_percent=9.0)
+
+    created = client.post(
+        "/v1/jobs",
+        json={"task_type": "EMBED", "payload_ref": "demo://batch", "task_count": 2},
+    )
+    job_id = created.json()["id"]
+
+    pulled = client.post(
+        "/v1/tasks/pull",
+        headers=_agent_headers(),
+        json={"node_id": "worker-a", "max_tasks": 2},
+    )
+    task_ids = [task["id"] for task in pulled.json()["tasks"]]
+
+    response = client.post(
+        "/v1/tasks/results/batch",
+        headers=_agent_headers(),
+        json={
+            "results": [
+                {
+                    "task_id": task_id,
+                    "node_id": "worker-a",
+                    "success": True,
+                    "duration_ms": 10,
+                }
+                for task_id in [*task_ids, "task-missing"]
+            ]
+        },
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert sorted(task["id"] for task in payload["accepted"]) == sorted(task_ids)
+    assert payload["rejected"] == [
+        {
+            "task_id": "task-missing",
+            "status_code": 404,
+            "detail": "Task 'task-missing' not found",
+        }
+    ]
+    assert client.get(f"/v1/jobs/{job_id}").json()["status"] == "COMPLETED"
+
+
+def test_task_retry_and_reassignment(client: TestClient) -> None:
+    from api.routers.tasks import configure_task_lease
+
+    configure_task_lease(1)
 
     _register_agent_v1(client, node_id="worker-1", has_gpu=False)
     _register_agent_v1(client, node_id="worker-2", has_gpu=False)
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from api import tasks
+
+
+def test_housekeeping_survives_failing_sweeps(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = {"recovery": 0, "offline": 0}
+
+    def failing_recovery() -> None:
+        calls["recovery"] += 1
+        raise RuntimeError("database is locked")
+
+    async def failing_offline_scan(stale_seconds: int) -> None:
+        calls["offline"] += 1
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(tasks, "_recover_stale_tasks", failing_recovery)
+    monkeypatch.setattr(tasks, "_mark_stale_nodes_offline", failing_offline_scan)
+
+    async def scenario() -> None:
+        monitor = asyncio.create_task(
+            tasks.housekeeping_monitor(
+                15, recovery_interval_seconds=0.01, offline_scan_interval_seconds=0.01
+            )
+        )
+        await asyncio.sleep(0.1)
+        assert not monitor.done()
+        monitor.cancel()
+
+    asyncio.run(scenario())
+
+    assert calls["recovery"] >= 2
+    assert calls["offline"] >= 2
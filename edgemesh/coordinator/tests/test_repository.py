@@ -79,6 +79,43 @@ def test_repository_node_crud(tmp_path) -> None:
     repo.close()
 
 
+def test_repository_record_node_heartbeat(tmp_path) -> None:
+    db_path = tmp_path / "repo-heartbeat.db"
+    repo = CoordinatorRepository(f"sqlite:///{db_path}")
+
+    event = repo.record_node_heartbeat(
+        node_id="node-new", metrics=NodeMetrics(cpu_percent=12, running_jobs=1)
+    )
+    assert event.node_id == "node-new"
+    assert event.status == NodeStatus.ONLINE
+
+    created = repo.get_node("node-new")
+    assert created is not None
+    assert created.status == NodeStatus.ONLINE
+    assert created.metrics.cpu_percent == 12
+
+    repo.upsert_node_identity(
+        node_id="node-new", display_name="Known", ip="10.0.0.9", port=7002
+    )
+    repo.record_node_heartbeat(node_id="node-new", metrics={"cpu_percent": 40})
+
+    updated = repo.get_node("node-new")
+    assert updated is not None
+    assert updated.identity.display_name == "Known"
+    assert updated.metrics.cpu_percent == 40
+    assert updated.metrics.running_jobs == 0
+    repo.close()
+
+    reopened = CoordinatorRepository(f"sqlite:///{db_path}")
+    persisted = reopened.get_node("node-new")
+    assert persisted is not None
+    assert persisted.identity.display_name == "Known"
+    assert persisted.metrics.cpu_percent == 40
+    assert persisted.last_seen == updated.last_seen
+
+    reopened.close()
+
+
 def test_repository_job_crud_and_transitions(tmp_path) -> None:
     db_path = tmp_path / "job-test.db"
     repo = CoordinatorRepository(f"sqlite:///{db_path}")
@@ -160,6 +197,8 @@ def test_repository_task_lifecycle_and_metrics(tmp_path) -> None:
 
     pulled = repo.pull_task_for_node("worker-1", lease_seconds=30)
     assert pulled is not None
+    job_running = repo.get_job(job.id)
+    assert job_running is not None
 
     task_after, job_after = repo.submit_task_result(
         TaskResult(
@@ -172,8 +211,78 @@ def test_repository_task_lifecycle_and_metrics(tmp_path) -> None:
     )
     assert task_after.status == TaskStatus.COMPLETED
     assert job_after.completed_tasks == 1
+    assert job_after.status == job_running.status == JobStatus.RUNNING
+    assert job_after.updated_at > job_running.updated_at
+    assert job_after.queued_tasks == 1
+    assert job_after.total_tasks == 2
+    assert job_after.assigned_nodes == ["worker-1"]
+    assert job_after.avg_task_duration_ms == 123
+    assert job_after.throughput_tasks_per_minute is not None
 
     metrics = repo.get_execution_metrics()
     assert metrics["success_results"] >= 1
+    assert metrics["total_results"] == 1
+    assert metrics["avg_duration_ms"] == 123
+    assert metrics["throughput_tasks_per_minute"] == 0.2
+    assert metrics["node_reliability"] == {"worker-1": 1.0}
+
+    repo.close()
+
+    reopened = CoordinatorRepository(f"sqlite:///{db_path}")
+    assert reopened.get_execution_metrics() == metrics
+    reopened.close()
+
+
+def test_repository_recovers_expired_leases(tmp_path) -> None:
+    db_path = tmp_path / "repo-lease.db"
+    repo = CoordinatorRepository(f"sqlite:///{db_path}")
+
+    repo.upsert_node_identity(
+        node_id="worker-1",
+        display_name="Worker 1",
+        ip="127.0.0.1",
+        port=9100,
+    )
+    repo.upsert_node_capabilities(
+        node_id="worker-1",
+        capabilities=NodeCapabilities(
+            task_types=[TaskType.TOKENIZE],
+            labels=["cpu"],
+            cpu_threads=4,
+            ram_total_gb=8,
+        ),
+    )
+    repo.update_node_metrics(
+        node_id="worker-1",
+        metrics=NodeMetrics(cpu_percent=10, ram_percent=20, running_jobs=0),
+    )
+    job = repo.create_job(Job(id="job-lease-1", type=TaskType.TOKENIZE))
+    (task,) = repo.create_tasks(
+        job_id=job.id,
+        task_type=TaskType.TOKENIZE,
+        payloads=[{"text": "a"}],
+        max_retries=1,
+    )
+
+    assert repo.pull_task_for_node("worker-1", lease_seconds=0) is not None
+    (requeued,) = repo.recover_stale_tasks()
+    assert requeued.id == task.id
+    assert requeued.status == TaskStatus.QUEUED
+    assert requeued.retries == 1
+    assert requeued.assigned_node_id is None
+    assert requeued.lease_expires_at is None
+
+    assert repo.pull_task_for_node("worker-1", lease_seconds=0) is not None
+    (failed,) = repo.recover_stale_tasks()
+    assert failed.status == TaskStatus.FAILED
+    assert failed.retries == 2
+    assert failed.completed_at is not None
+    assert failed.error == "Task lease expired"
+    assert repo.recover_stale_tasks() == []
+
+    job_after = repo.get_job(job.id)
+    assert job_after is not None
+    assert job_after.status == JobStatus.FAILED
+    assert job_after.failed_tasks == 1
 
     repo.close()
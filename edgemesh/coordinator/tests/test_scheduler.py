@@ -8,7 +8,12 @@ from models import (
     RolePreference,
     TaskType,
 )
-from scheduler import compute_effective_capacity, is_node_eligible, score_node
+from scheduler import (
+    compute_effective_capacity,
+    is_node_eligible,
+    rank_nodes,
+    score_node,
+)
 
 
 def _build_node(
@@ -107,3 +112,24 @@ def test_embed_scoring_prefers_cpu_nodes_with_cpu_role() -> None:
     assert score_node(cpu_node, TaskType.EMBEDDINGS) > score_node(
         gpu_node, TaskType.EMBEDDINGS
     )
+
+
+def test_rank_nodes_orders_eligible_nodes_by_score() -> None:
+    cpu_node = _build_node(
+        has_gpu=False, role_preference=RolePreference.PREFER_EMBEDDINGS
+    )
+    cpu_node.identity.node_id = "cpu"
+    gpu_node = _build_node(
+        has_gpu=True, role_preference=RolePreference.PREFER_INFERENCE
+    )
+    gpu_node.identity.node_id = "gpu"
+    busy_node = _build_node(has_gpu=True)
+    busy_node.identity.node_id = "busy"
+    busy_node.metrics.cpu_percent = 60
+
+    ranked = rank_nodes([gpu_node, busy_node, cpu_node], TaskType.EMBEDDINGS)
+
+    assert ranked == [
+        ("cpu", score_node(cpu_node, TaskType.EMBEDDINGS)),
+        ("gpu", score_node(gpu_node, TaskType.EMBEDDINGS)),
+    ]
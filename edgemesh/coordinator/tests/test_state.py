@@ -0,0 +1,54 @@
+import asyncio
+
+from api.state import NodeEventBus, NodeEventQueue
+from models import NodeMetrics, NodeStatus, NodeUpdateEvent
+
+
+def _event(node_id: str, cpu_percent: float) -> NodeUpdateEvent:
+    return NodeUpdateEvent(
+        node_id=node_id,
+        status=NodeStatus.ONLINE,
+        metrics=NodeMetrics(cpu_percent=cpu_percent),
+    )
+
+
+def _frame(node_id: str, cpu_percent: float) -> bytes:
+    return f"{node_id}:{cpu_percent}".encode()
+
+
+def test_node_event_queue_coalesces_same_node_on_overflow() -> None:
+    queue = NodeEventQueue(maxsize=2)
+
+    queue.offer("node-a", _frame("node-a", 10))
+    queue.offer("node-b", _frame("node-b", 20))
+    queue.offer("node-a", _frame("node-a", 30))
+
+    assert queue.drain() == [_frame("node-b", 20), _frame("node-a", 30)]
+    assert queue.dropped == 0
+
+
+def test_node_event_queue_counts_drops_without_coalescing() -> None:
+    queue = NodeEventQueue(maxsize=2)
+
+    queue.offer("node-a", _frame("node-a", 10))
+    queue.offer("node-b", _frame("node-b", 20))
+    queue.offer("node-c", _frame("node-c", 30))
+
+    assert queue.drain() == [_frame("node-b", 20), _frame("node-c", 30)]
+    assert queue.dropped == 1
+
+
+def test_node_event_bus_shares_one_rendered_frame_across_subscribers() -> None:
+    async def scenario() -> tuple[list[bytes], list[bytes]]:
+        bus = NodeEventBus(queue_size=4)
+        first = await bus.subscribe()
+        second = await bus.subscribe()
+        await bus.publish(_event("node-a", 10))
+        return first.drain(), second.drain()
+
+    first_frames, second_frames = asyncio.run(scenario())
+
+    assert first_frames == second_frames
+    assert first_frames[0] is second_frames[0]
+    assert first_frames[0].startswith(b"event: node_update\ndata: ")
+    assert first_frames[0].endswith(b"\n\n")